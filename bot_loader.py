@@ -1,7 +1,38 @@
 import asyncio
 
-from src.utils import load_config, AccountProgress
+from src.models import Account
+from src.utils import (
+    load_config, AccountProgress, AdaptiveConcurrency, 
+    adaptive_concurrency, resource_limits
+)
+from configs import ADAPTIVE_CONCURRENCY
 
 config = load_config()
-semaphore = asyncio.Semaphore(config.threads)
-progress = AccountProgress(len(config.accounts))
\ No newline at end of file
+resource_limits.configure(config.limits)
+
+
+def _create_semaphore() -> asyncio.Semaphore | AdaptiveConcurrency:
+    if ADAPTIVE_CONCURRENCY:
+        adaptive_concurrency.configure(config.threads)
+        return adaptive_concurrency
+    return asyncio.Semaphore(config.threads)
+
+
+semaphore = _create_semaphore()
+progress = AccountProgress(len(config.accounts))
+
+
+def apply_overrides(
+    threads: int | None = None, 
+    accounts: list[Account] | None = None
+) -> None:
+    # Must run before module_processor is imported: it binds semaphore and progress at import time
+    global semaphore, progress
+    
+    if threads:
+        config.threads = threads
+    if accounts is not None:
+        config.accounts = accounts
+        
+    semaphore = _create_semaphore()
+    progress = AccountProgress(len(config.accounts))
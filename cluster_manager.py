@@ -0,0 +1,441 @@
+import asyncio
+import hmac
+import itertools
+import json
+import os
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from bot_loader import config, progress
+from module_processor import ModuleProcessor
+from preflight import preflight_scanner
+from src.exceptions.custom_exceptions import ChainMismatchError
+from src.logger import AsyncLogger
+from src.rpc import provider_pool
+from src.utils.journal import run_journal
+
+
+logger = AsyncLogger()
+
+LEASE_TIMEOUT = 180  # seconds without a heartbeat before a worker's accounts are handed out again
+CLUSTER_TOKEN_ENV = "EXPCHAIN_CLUSTER_TOKEN"
+
+
+class ClusterProtocolError(Exception):
+    """Unexpected or malformed message between coordinator and worker"""
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def _receive(reader: asyncio.StreamReader) -> dict[str, Any]:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by peer")
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as error:
+        raise ClusterProtocolError(f"Invalid message: {line[:100]!r}") from error
+
+
+def parse_endpoint(endpoint: str) -> tuple[str, str | int | None]:
+    """'unix:/path/to.sock' -> ('unix', path), 'host:port' -> (host, port)."""
+    if endpoint.startswith("unix:"):
+        return "unix", endpoint[5:]
+    host, _, port = endpoint.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError as error:
+        raise ValueError(f"Invalid endpoint '{endpoint}', expected host:port or unix:/path") from error
+
+
+@dataclass(slots=True)
+class Lease:
+    lease_id: int
+    index: int
+    worker: str
+    expires_at: float
+
+
+class Coordinator:
+    """
+    Owns the account list and the run journal and hands out account leases
+    to workers over a newline-delimited JSON protocol.
+
+    Workers renew their leases with heartbeats; a lease that is not renewed
+    within LEASE_TIMEOUT is returned to the queue for another worker.
+    """
+
+    def __init__(self, module_name: str, token: str | None = None, lease_timeout: int = LEASE_TIMEOUT):
+        self.module_name = module_name
+        self.token = token or ""
+        self.lease_timeout = lease_timeout
+        self.processor = ModuleProcessor(interactive=False)
+
+        self._accounts = {account.index: account for account in config.accounts}
+        self._pending: deque[int] = deque()
+        self._leases: dict[int, Lease] = {}
+        self._finished: set[int] = set()
+        self._lease_ids = itertools.count(1)
+        self._done = asyncio.Event()
+
+    async def _prepare(self) -> None:
+        config.module = self.module_name
+        self.processor._initialize_progress_and_reporter(self.module_name)
+        if run_journal.start_run(self.module_name):
+            await logger.logger_msg(
+                f"Resuming unfinished '{self.module_name}' run #{run_journal.run_id}", type_msg="info"
+            )
+        completed = run_journal.completed_accounts()
+        skipped = await preflight_scanner.scan(self.module_name, [
+            account for account in config.accounts
+            if account.address not in completed
+        ])
+
+        for account in config.accounts:
+            address = account.address
+            if address in skipped:
+                message = f"Skipped by preflight: {skipped[address]}"
+                self._finished.add(account.index)
+                progress.increment()
+                self.processor.telegram_reporter.add_result(account, False, message)
+                run_journal.record_account(address, False, message)
+            elif address in completed:
+                success, message = completed[address]
+                self._finished.add(account.index)
+                if success:
+                    progress.success += 1
+                progress.increment()
+                self.processor.telegram_reporter.add_result(account, success, message)
+            else:
+                self._pending.append(account.index)
+
+    def _check_done(self) -> None:
+        if not self._pending and not self._leases:
+            self._done.set()
+
+    def _grant(self, worker: str, count: int) -> list[dict[str, Any]]:
+        granted = []
+        expires_at = time.monotonic() + self.lease_timeout
+        while self._pending and len(granted) < count:
+            index = self._pending.popleft()
+            if index in self._finished:
+                continue
+            lease = Lease(next(self._lease_ids), index, worker, expires_at)
+            self._leases[lease.lease_id] = lease
+            granted.append({
+                "lease_id": lease.lease_id,
+                "index": index,
+                "address": self._accounts[index].address
+            })
+        return granted
+
+    def _renew(self, worker: str, lease_ids: list[int]) -> None:
+        expires_at = time.monotonic() + self.lease_timeout
+        for lease_id in lease_ids:
+            lease = self._leases.get(lease_id)
+            if lease and lease.worker == worker:
+                lease.expires_at = expires_at
+
+    async def _complete(self, message: dict[str, Any]) -> None:
+        lease = self._leases.pop(message.get("lease_id"), None)
+        index = message.get("index")
+        account = self._accounts.get(index)
+
+        if account is None or index in self._finished:
+            self._check_done()
+            return
+        if lease is None:
+            # The lease already expired and was requeued: the late result still counts
+            try:
+                self._pending.remove(index)
+            except ValueError:
+                pass
+
+        success, text = bool(message.get("success")), str(message.get("message", ""))
+        module_results = message.get("module_results") or None
+
+        self._finished.add(index)
+        run_journal.record_account(account.address, success, text)
+        self.processor.telegram_reporter.add_result(account, success, text, module_results=module_results)
+        await self.processor._update_statistics(success)
+        self._check_done()
+
+    async def _requeue(self, leases: list[Lease], reason: str) -> None:
+        for lease in leases:
+            del self._leases[lease.lease_id]
+            self._pending.appendleft(lease.index)
+            await logger.logger_msg(
+                f"Account #{lease.index} held by {lease.worker} {reason}, requeued",
+                type_msg="warning", method_name="_requeue"
+            )
+
+    async def _expire_leases(self) -> None:
+        while not self._done.is_set():
+            await asyncio.sleep(min(5, self.lease_timeout / 3))
+            now = time.monotonic()
+            await self._requeue(
+                [lease for lease in self._leases.values() if lease.expires_at <= now],
+                "lease expired"
+            )
+
+    async def _handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        worker = "unknown"
+        try:
+            hello = await _receive(reader)
+            if hello.get("type") != "hello" or not hmac.compare_digest(str(hello.get("token", "")), self.token):
+                await _send(writer, {"type": "error", "message": "Authentication failed"})
+                return
+
+            worker = str(hello.get("worker", worker))
+            await _send(writer, {
+                "type": "welcome",
+                "module": self.module_name,
+                "lease_timeout": self.lease_timeout
+            })
+            await logger.logger_msg(f"Worker {worker} connected", type_msg="info")
+
+            while True:
+                message = await _receive(reader)
+                message_type = message.get("type")
+
+                if message_type == "lease":
+                    granted = self._grant(worker, int(message.get("max", 1)))
+                    if granted:
+                        await _send(writer, {"type": "accounts", "leases": granted})
+                    elif self._done.is_set() or (not self._pending and not self._leases):
+                        await _send(writer, {"type": "done"})
+                    else:
+                        await _send(writer, {"type": "wait"})
+
+                elif message_type == "heartbeat":
+                    self._renew(worker, message.get("leases", []))
+                    await _send(writer, {"type": "ack"})
+
+                elif message_type == "result":
+                    await self._complete(message)
+                    await _send(writer, {"type": "ack"})
+
+                else:
+                    raise ClusterProtocolError(f"Unknown message type: {message_type}")
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ClusterProtocolError as error:
+            await logger.logger_msg(
+                f"Protocol error from {worker}: {error}", type_msg="error", method_name="_handle_worker"
+            )
+        finally:
+            await self._requeue(
+                [lease for lease in self._leases.values() if lease.worker == worker],
+                "worker disconnected"
+            )
+            await logger.logger_msg(f"Worker {worker} disconnected", type_msg="info")
+            writer.close()
+
+    async def run(self, endpoint: str) -> int:
+        if self.module_name not in self.processor.module_functions:
+            await logger.logger_msg(
+                f"Module {self.module_name} is not implemented!",
+                type_msg="error", method_name="run"
+            )
+            return 2
+
+        try:
+            await preflight_scanner.verify_chains()
+        except ChainMismatchError as error:
+            await logger.logger_msg(str(error), type_msg="error", method_name="run")
+            await provider_pool.close()
+            return 2
+
+        await self._prepare()
+        self._check_done()
+
+        host, port = parse_endpoint(endpoint)
+        if host == "unix":
+            server = await asyncio.start_unix_server(self._handle_worker, path=port)
+        else:
+            server = await asyncio.start_server(self._handle_worker, host, port)
+
+        await logger.logger_msg(
+            f"Coordinator for '{self.module_name}' listening on {endpoint}: "
+            f"{len(self._pending)} accounts to lease",
+            type_msg="info"
+        )
+
+        expiry_task = asyncio.create_task(self._expire_leases())
+        try:
+            async with server:
+                await self._done.wait()
+                # Let connected workers receive their 'done' reply before closing
+                await asyncio.sleep(1)
+        finally:
+            expiry_task.cancel()
+
+        run_journal.finish_run()
+        await self.processor._show_final_stats()
+        run_journal.close()
+        await provider_pool.close()
+        return 0 if progress.total and progress.success == progress.total else 1
+
+
+class Worker:
+    """
+    Pulls account leases from a coordinator, runs them through
+    ModuleProcessor.process_account and streams the results back.
+
+    Accounts are resolved by their number in the local accounts.xlsx, so
+    keys never cross the wire and every host can use its own proxies.
+    """
+
+    def __init__(self, endpoint: str, token: str | None = None, name: str | None = None):
+        self.endpoint = endpoint
+        self.token = token or ""
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.processor = ModuleProcessor(interactive=False)
+
+        self._accounts = {account.index: account for account in config.accounts}
+        self._in_flight: dict[int, asyncio.Task] = {}
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def _request(self, message: dict[str, Any]) -> dict[str, Any]:
+        async with self._lock:
+            await _send(self._writer, message)
+            return await _receive(self._reader)
+
+    async def _connect(self) -> dict[str, Any]:
+        host, port = parse_endpoint(self.endpoint)
+        if host == "unix":
+            self._reader, self._writer = await asyncio.open_unix_connection(port)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+
+        welcome = await self._request({"type": "hello", "worker": self.name, "token": self.token})
+        if welcome.get("type") != "welcome":
+            raise ClusterProtocolError(welcome.get("message", "Coordinator rejected the worker"))
+        return welcome
+
+    async def _heartbeat(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if self._in_flight:
+                await self._request({"type": "heartbeat", "leases": list(self._in_flight)})
+
+    async def _run_lease(self, lease: dict[str, Any], process_func) -> None:
+        lease_id, index = lease["lease_id"], lease["index"]
+        account = self._accounts.get(index)
+
+        try:
+            if account is None or account.address != lease.get("address"):
+                success, message, module_results = (
+                    False, f"Account #{index} does not match the coordinator's accounts file", None
+                )
+            else:
+                success, message = await self.processor.process_account(account, process_func)
+                result = self.processor.telegram_reporter.account_results.get(lease["address"])
+                module_results = result.module_results if result else None
+
+            await self._request({
+                "type": "result",
+                "lease_id": lease_id,
+                "index": index,
+                "success": success,
+                "message": str(message),
+                "module_results": module_results
+            })
+        finally:
+            self._in_flight.pop(lease_id, None)
+
+    async def run(self) -> int:
+        welcome = await self._connect()
+        module_name = welcome["module"]
+
+        process_func = self.processor.module_functions.get(module_name)
+        if not process_func:
+            await logger.logger_msg(
+                f"Module {module_name} is not implemented on this worker!",
+                type_msg="error", method_name="run"
+            )
+            return 2
+
+        config.module = module_name
+        self.processor._initialize_progress_and_reporter(module_name)
+        capacity = max(1, config.threads)
+
+        await logger.logger_msg(
+            f"Worker {self.name} joined '{module_name}' run with {capacity} threads", type_msg="info"
+        )
+
+        heartbeat = asyncio.create_task(self._heartbeat(welcome.get("lease_timeout", LEASE_TIMEOUT) / 3))
+        try:
+            while True:
+                if len(self._in_flight) >= capacity:
+                    await asyncio.wait(list(self._in_flight.values()), return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                reply = await self._request({"type": "lease", "max": capacity - len(self._in_flight)})
+
+                if reply.get("type") == "accounts":
+                    for lease in reply["leases"]:
+                        self._in_flight[lease["lease_id"]] = asyncio.create_task(
+                            self._run_lease(lease, process_func)
+                        )
+                elif reply.get("type") == "done":
+                    break
+                else:
+                    await asyncio.sleep(1)
+
+            if self._in_flight:
+                await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        finally:
+            heartbeat.cancel()
+            self._writer.close()
+            await provider_pool.close()
+
+        return 0
+
+
+def cluster_token() -> str:
+    return os.environ.get(CLUSTER_TOKEN_ENV, "")
+
+
+def _unauthenticated_tcp(endpoint: str, token: str) -> bool:
+    # Unix sockets are protected by file permissions, TCP endpoints only by the token
+    try:
+        return not token and parse_endpoint(endpoint)[0] != "unix"
+    except ValueError:
+        return False
+
+
+async def run_coordinator(module_name: str, endpoint: str) -> int:
+    token = cluster_token()
+    if _unauthenticated_tcp(endpoint, token):
+        await logger.logger_msg(
+            f"Set {CLUSTER_TOKEN_ENV} to a shared secret before serving workers over TCP",
+            type_msg="error", method_name="run_coordinator"
+        )
+        return 2
+    return await Coordinator(module_name, token=token).run(endpoint)
+
+
+async def run_worker(endpoint: str) -> int:
+    if _unauthenticated_tcp(endpoint, cluster_token()):
+        await logger.logger_msg(
+            f"Set {CLUSTER_TOKEN_ENV} to the coordinator's secret before connecting over TCP",
+            type_msg="error", method_name="run_worker"
+        )
+        return 2
+    try:
+        return await Worker(endpoint, token=cluster_token()).run()
+    except (ConnectionError, OSError, ClusterProtocolError) as error:
+        await logger.logger_msg(
+            f"Worker stopped: {error}", type_msg="error", method_name="run_worker"
+        )
+        return 1
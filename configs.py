@@ -1,10 +1,45 @@
 # ---------------------------------- Extra ----------------------------------
 SHUFFLE_WALLETS = True  # True/False Shuffle wallets before use
+ACCOUNT_KEY_CACHE = True  # True/False Keep derived keys and addresses encrypted in config/data/account_keys.json so unchanged rows skip derivation
+DERIVATION_PROCESSES = 0  # Processes deriving keys of new accounts at startup, 0 = one per CPU
+DERIVATION_CHUNK_SIZE = 250  # Accounts derived per task sent to a process (fewer new accounts are derived in-process)
 
 # --------------------------------- General ---------------------------------
 MAX_RETRY_ATTEMPTS = 5  # Number of retry attempts for failed requests
 RETRY_SLEEP_RANGE = (3, 9)  # (min, max) in seconds
 
+# -------------------------------- Scheduling --------------------------------
+RELEASE_SLOT_ON_SLEEP = True  # True/False Sleeping accounts give their thread slot to other accounts
+MAX_ACCOUNTS_IN_FLIGHT = 100  # Max accounts started at once (incl. sleeping) when RELEASE_SLOT_ON_SLEEP is on
+USE_RUN_JOURNAL = True  # True/False Record results to config/data/run_journal.db and resume interrupted runs
+RUN_RESUME_MAX_AGE = 12  # Hours since its last result after which an interrupted run is no longer resumed and a new one starts
+ADAPTIVE_CONCURRENCY = True  # True/False Grow and shrink 'threads' at runtime based on RPC/API latency and errors
+ADAPTIVE_MIN_THREADS = 2  # Lowest live thread limit; 'threads' from settings.yaml is both the starting value and the maximum
+ADAPTIVE_P95_LATENCY = 3.0  # Request p95 latency in seconds above which the thread limit is reduced
+ADAPTIVE_ERROR_RATE = 0.05  # Share of timeouts, -32002 and 429 responses above which the thread limit is reduced
+PREFLIGHT_SCAN = True  # True/False Read all required balances in bulk and skip ineligible accounts before the run
+PREFLIGHT_BATCH_SIZE = 100  # Addresses read per request during the preflight scan
+
+# ----------------------------------- RPC -----------------------------------
+RPC_POOL_CONNECTIONS = 100  # Max open connections per RPC endpoint and proxy, shared by all wallets
+RPC_POOL_KEEPALIVE = 30  # Seconds an idle keep-alive connection to an RPC stays open
+RPC_POOL_IDLE_TIMEOUT = 300  # Seconds without requests after which an endpoint's connection pool is closed
+WS_HEARTBEAT = 20  # Seconds between pings on shared WebSocket RPC connections (ws:// and wss:// endpoints)
+RPC_EJECT_ERRORS = 3  # Failed requests in a row after which an endpoint of a multi-RPC chain is taken out of rotation
+RPC_EJECT_SECONDS = 30  # Seconds before an ejected endpoint is probed again (doubles on repeated ejections)
+RPC_HEDGING = True  # True/False Send slow reads to a second endpoint of a multi-RPC chain; the first answer wins
+RPC_HEDGE_PERCENTILE = 95  # Latency percentile of a read method after which the read is hedged
+RPC_HEDGE_DELAY = 1.0  # Seconds before hedging while too few latencies of a method are known
+RPC_BATCHING = True  # True/False Send concurrent read-only RPC calls to the same endpoint as one JSON-RPC batch
+RPC_BATCH_WINDOW = 0.01  # Seconds to collect calls before a batch is sent
+RPC_BATCH_SIZE = 50  # Max calls in one batch
+USE_MULTICALL = True  # True/False Read balances of many tokens/accounts through Multicall3 where it is deployed
+MULTICALL_BATCH_SIZE = 200  # Max calls aggregated into one Multicall3 request
+FEE_REFRESH_INTERVAL = 3.0  # Seconds fee data of a chain is reused by all wallets (about one block)
+FEE_HISTORY_BLOCKS = 10  # Blocks of eth_feeHistory used to suggest the priority fee
+FEE_PRIORITY_PERCENTILE = 50  # Percentile of recent priority fees to pay
+RECEIPT_POLL_INTERVAL = 1.0  # Seconds between new block checks of the shared per-chain receipt watcher
+
 # --------------------------------- Faucet ---------------------------------
 FAUCET_CHAINS = ['EXPchain', 'Sepolia', 'BSC']
 FAUCET_SLEEP_RANGE_BETWEEN_CHAINS = (30, 60)  # (min, max) in seconds
@@ -39,6 +74,15 @@ ROUTE_TASK = [
     'swap',
 ]
 
+PARALLEL_ROUTE_TASKS = True  # True/False Run independent route tasks of one account at the same time
+
+# Tasks listed on the right must finish before the task on the left starts
+ROUTE_DEPENDENCIES = {
+    'bridge_sepolia': ['faucet'],
+    'bridge_bsc': ['faucet'],
+    'swap': ['faucet', 'bridge_sepolia', 'bridge_bsc'],
+}
+
 """
 Modules for route generation:
     - faucet                   Requesting tokens from the faucet
@@ -1,30 +1,44 @@
 import asyncio
 import os
 import sys
-from typing import Callable
+from typing import Callable, Iterator
 
-from src.console import Console
 from src.task_manager import EXPchainBot
 from bot_loader import config, progress, semaphore
 from src.logger import AsyncLogger
 from src.models import Account
-from src.utils import get_address, random_sleep
+from src.rpc import endpoint_registry, provider_pool
+from src.utils import (
+    AdaptiveConcurrency, ConcurrencySlot, random_sleep, timer_service
+)
+from src.utils.journal import run_journal
 from src.utils.send_tg_message import SendTgMessage
 from src.utils.telegram_reporter import TelegramReporter
 from route_manager import RouteManager, get_optimized_route
+from preflight import preflight_scanner
+from configs import MAX_ACCOUNTS_IN_FLIGHT, RELEASE_SLOT_ON_SLEEP
 
 
 logger = AsyncLogger()
 
 
 class ModuleProcessor:
-    def __init__(self):
-        self.console = Console()
+    def __init__(
+        self, 
+        interactive: bool = True, 
+        reporter: TelegramReporter | None = None
+    ):
+        self.console = self._create_console() if interactive else None
         self.module_functions = self._load_module_functions()
         
-        self.telegram_reporter = TelegramReporter()
+        self.telegram_reporter = reporter or TelegramReporter()
         self.route_manager = RouteManager()
     
+    @staticmethod
+    def _create_console():
+        from src.console import Console
+        return Console()
+    
     @staticmethod
     def _load_module_functions() -> dict[str, Callable]:
         return {
@@ -38,15 +52,14 @@ class ModuleProcessor:
         account: Account, 
         process_func: Callable
     ) -> tuple[bool, str]:
-        address = get_address(account.keypair)
+        address = account.address
+        is_route = config.module == "auto_route"
+        module_name = "auto_route" if is_route else None
         
-        async with semaphore:
+        await self._apply_start_delay()
+        
+        async with ConcurrencySlot(semaphore):
             try:
-                await self._apply_start_delay()
-                    
-                is_route = config.module == "auto_route"
-                module_name = "auto_route" if is_route else None
-                    
                 result = await process_func(account)
                 
                 if is_route and isinstance(result, tuple):
@@ -55,6 +68,7 @@ class ModuleProcessor:
                         await self._update_statistics(success)
                         self.telegram_reporter.add_result(account, success, message, 
                                                          module_results=module_results)
+                        run_journal.record_account(address, success, message)
                         return success, message
                     else:
                         success, message = result[0], result[1]
@@ -64,6 +78,7 @@ class ModuleProcessor:
                 await self._update_statistics(success)
                 
                 self.telegram_reporter.add_result(account, success, message, module=module_name)
+                run_journal.record_account(address, success, message)
                 
                 return success, message
                 
@@ -78,6 +93,7 @@ class ModuleProcessor:
                 )
                 
                 self.telegram_reporter.add_result(account, False, error_msg, module=module_name)
+                run_journal.record_account(address, False, error_msg)
                 
                 return False, error_msg
     
@@ -107,6 +123,10 @@ class ModuleProcessor:
             f"📊 Statistics: {progress.processed}/{progress.total} accounts processed | "
             f"✅ Success: {progress.success} ({success_rate}%)"
         )
+        if isinstance(semaphore, AdaptiveConcurrency):
+            log_message += f" | ⚙️ Threads: {semaphore.limit}"
+        if timer_service.pending:
+            log_message += f" | 💤 Sleeping: {timer_service.pending}"
         await logger.logger_msg(log_message, type_msg="info")
     
     async def send_stats_to_telegram(
@@ -144,7 +164,7 @@ class ModuleProcessor:
         self._initialize_progress_and_reporter(module_name)
         
         try:
-            await self._process_accounts_in_batches(process_func)
+            await self._process_accounts(process_func)
             await self._show_final_stats()
             return False
             
@@ -166,7 +186,7 @@ class ModuleProcessor:
         self.telegram_reporter.set_module(module_name)
     
     def _get_first_account_address(self) -> str:
-        return get_address(config.accounts[0].keypair) if config.accounts else "Unknown"
+        return config.accounts[0].address if config.accounts else "Unknown"
     
     async def _process_auto_route(self) -> bool:
         route = await get_optimized_route()
@@ -194,7 +214,7 @@ class ModuleProcessor:
         
         sys.modules["module_processor_reporter"] = self.telegram_reporter
         
-        await self._process_accounts_in_batches(auto_route_func)
+        await self._process_accounts(auto_route_func)
         await self._show_final_stats()
         
         if "module_processor_reporter" in sys.modules:
@@ -202,25 +222,98 @@ class ModuleProcessor:
         
         return False
     
-    async def _process_accounts_in_batches(self, process_func: Callable) -> None:
-        batch_size = getattr(config, 'threads', len(config.accounts))
+    async def _process_accounts(self, process_func: Callable) -> None:
+        await preflight_scanner.verify_chains()
+        await preflight_scanner.warm_token_metadata()
+        resumed = run_journal.start_run(config.module)
+        completed = run_journal.completed_accounts()
+        
+        if resumed:
+            await logger.logger_msg(
+                f"Resuming unfinished '{config.module}' run #{run_journal.run_id}: "
+                f"{len(completed)} accounts that already succeeded will be skipped",
+                type_msg="info"
+            )
+        
+        skipped = await preflight_scanner.scan(config.module, [
+            account for account in config.accounts
+            if account.address not in completed
+        ])
+        
+        accounts = self._pending_accounts(completed, skipped)
+        pending_count = sum(
+            1 for account in config.accounts
+            if account.address not in completed and account.address not in skipped
+        )
+        workers_count = getattr(config, 'threads', 1)
+        if RELEASE_SLOT_ON_SLEEP:
+            workers_count = max(workers_count, MAX_ACCOUNTS_IN_FLIGHT)
+        workers_count = max(1, min(workers_count, pending_count))
         
-        for i in range(0, len(config.accounts), batch_size):
-            batch_accounts = config.accounts[i:i + batch_size]
-            batch_tasks = [
-                self.process_account(account, process_func) 
-                for account in batch_accounts
-            ]
+        workers = [
+            asyncio.create_task(self._account_worker(accounts, process_func))
+            for _ in range(workers_count)
+        ]
+        
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            for worker in workers:
+                worker.cancel()
+            raise
+        
+        run_journal.finish_run()
+    
+    def _pending_accounts(
+        self, 
+        completed: dict[str, tuple[bool, str]], 
+        skipped: dict[str, str]
+    ) -> Iterator[Account]:
+        for account in config.accounts:
+            if not completed and not skipped:
+                yield account
+                continue
+            
+            address = account.address
+            if address in skipped:
+                message = f"Skipped by preflight: {skipped[address]}"
+                progress.increment()
+                self.telegram_reporter.add_result(account, False, message)
+                run_journal.record_account(address, False, message)
+                continue
+            
+            if address not in completed:
+                yield account
+                continue
+            
+            success, message = completed[address]
+            if success:
+                progress.success += 1
+            progress.increment()
             
+            if config.module == "auto_route":
+                self.telegram_reporter.add_result(
+                    account, success, message, 
+                    module_results=run_journal.completed_tasks(address)
+                )
+            else:
+                self.telegram_reporter.add_result(account, success, message)
+    
+    async def _account_worker(
+        self, 
+        accounts: Iterator[Account], 
+        process_func: Callable
+    ) -> None:
+        for account in accounts:
             try:
-                await asyncio.gather(*batch_tasks)
+                await self.process_account(account, process_func)
             except asyncio.CancelledError:
                 raise
             except Exception as e:
                 await logger.logger_msg(
-                    f"Error processing batch: {str(e)}",
+                    f"Error processing account: {str(e)}",
                     type_msg="error",
-                    method_name="_process_accounts_in_batches"
+                    method_name="_account_worker"
                 )
     
     async def _show_final_stats(self) -> None:
@@ -244,6 +337,15 @@ class ModuleProcessor:
         await logger.logger_msg(f"✅ Success: {progress.success}/{progress.total} ({success_percent}%)", type_msg="info")
         await logger.logger_msg(f"❌ Errors: {error_count}/{progress.total} ({error_percent}%)", type_msg="info")
         await logger.logger_msg(f"⏱️ Total processed: {progress.processed}", type_msg="info")
+        hedged = {method: stats for method, stats in endpoint_registry.hedging_stats().items() if stats.hedged}
+        if hedged:
+            await logger.logger_msg(
+                "🔀 Hedged reads: " + " | ".join(
+                    f"{method} {stats.hedged}/{stats.requests} (second endpoint won {stats.hedge_wins})"
+                    for method, stats in hedged.items()
+                ),
+                type_msg="info"
+            )
         await logger.logger_msg(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", type_msg="info")
     
     async def cleanup(self) -> None:        
@@ -269,7 +371,8 @@ class ModuleProcessor:
             )
     
     async def execute(self) -> bool:
-        self.console.build()
+        if self.console:
+            self.console.build()
         try:
             return await self.process_module(config.module)
         except Exception as e:
@@ -319,8 +422,42 @@ async def main_loop() -> None:
     finally:
         if processor:
             await processor.cleanup()
+        run_journal.close()
+        await provider_pool.close()
 
     await logger.logger_msg(
         "👋 Goodbye! The terminal is ready for commands.", 
         type_msg="info"
-    ) 
\ No newline at end of file
+    )
+
+
+async def run_module(module_name: str, reporter: TelegramReporter | None = None) -> int:
+    """Run one module or auto_route without the menu and return a process exit code."""
+    config.module = module_name
+    progress.reset()
+    processor = ModuleProcessor(interactive=False, reporter=reporter)
+    
+    try:
+        if module_name not in processor.module_functions:
+            await logger.logger_msg(
+                f"Module {module_name} is not implemented! Available: "
+                f"{', '.join(sorted(processor.module_functions))}",
+                type_msg="error",
+                method_name="run_module"
+            )
+            return 2
+        
+        if not config.accounts:
+            await logger.logger_msg(
+                "No accounts match the selection", 
+                type_msg="error", 
+                method_name="run_module"
+            )
+            return 2
+        
+        await processor.execute()
+    finally:
+        run_journal.close()
+        await provider_pool.close()
+    
+    return 0 if progress.total and progress.success == progress.total else 1
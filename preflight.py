@@ -0,0 +1,248 @@
+import asyncio
+from typing import Callable
+
+from web3 import AsyncWeb3
+from web3.middleware import ExtraDataToPOAMiddleware
+
+from bot_loader import config
+from src.logger import AsyncLogger
+from src.exceptions.custom_exceptions import ChainMismatchError
+from src.models import Account, CHAINS
+from src.models.onchain_model import ERC20Contract
+from src.rpc import Multicall, TokenMetadata, endpoints_of, provider_pool, token_registry
+from src.utils import resource_limits
+from src.wallet import RequestMetricsMiddleware, ResourceLimitMiddleware
+from configs import AMOUNT_SWAP_ETH_TO_SEPOLIA, PREFLIGHT_BATCH_SIZE, PREFLIGHT_SCAN, SWAP_TOKENS
+
+
+logger = AsyncLogger()
+
+NATIVE = "0x0000000000000000000000000000000000000000"
+
+BalanceKey = tuple[str, str]
+Balances = dict[BalanceKey, int]
+
+
+def _bridge_check(chain: str) -> Callable[[Balances], str | None]:
+    token = CHAINS[chain].tokens["tZKJ"]
+
+    def check(balances: Balances) -> str | None:
+        if balances.get((chain, NATIVE)) == 0:
+            return "Insufficient native balance"
+        if balances.get((chain, token)) == 0:
+            return f"Not enough tokens tZKJ on the chain {chain}"
+        return None
+    return check
+
+
+def _swap_check(balances: Balances) -> str | None:
+    known = [balances.get(("EXPchain", address)) for address in SWAP_TOKENS.values()]
+    if None in known:
+        return None
+    if sum(1 for balance in known if balance > 0) < 2:
+        return "Insufficient tokens to swap"
+    return None
+
+
+def _buy_sepolia_check(balances: Balances) -> str | None:
+    balance = balances.get(("Arbitrum", NATIVE))
+    if balance is None or AMOUNT_SWAP_ETH_TO_SEPOLIA <= 0:
+        return None
+    if balance < AsyncWeb3.to_wei(AMOUNT_SWAP_ETH_TO_SEPOLIA, "ether"):
+        return f"Not enough $ETH in the Arbitrum network to purchase $tETH. Required: {AMOUNT_SWAP_ETH_TO_SEPOLIA} $ETH"
+    return None
+
+
+# Balances each module needs and the check turning them into a skip reason
+REQUIREMENTS: dict[str, tuple[list[BalanceKey], Callable[[Balances], str | None]]] = {
+    'bridge_sepolia': (
+        [('Sepolia', NATIVE), ('Sepolia', CHAINS['Sepolia'].tokens['tZKJ'])],
+        _bridge_check('Sepolia')
+    ),
+    'bridge_bsc': (
+        [('BSC', NATIVE), ('BSC', CHAINS['BSC'].tokens['tZKJ'])],
+        _bridge_check('BSC')
+    ),
+    'swap': (
+        [('EXPchain', address) for address in SWAP_TOKENS.values()],
+        _swap_check
+    ),
+    'buy_sepolia': (
+        [('Arbitrum', NATIVE)],
+        _buy_sepolia_check
+    ),
+}
+
+
+class PreflightScanner:
+    """
+    Reads every balance a module depends on for all accounts at once, one
+    multicall per chunk of addresses, and reports the accounts that would
+    fail the module's own balance checks.
+
+    Balances that could not be read never disqualify an account.
+    """
+
+    def __init__(self, batch_size: int = PREFLIGHT_BATCH_SIZE) -> None:
+        self.batch_size = max(1, batch_size)
+
+    @staticmethod
+    def _rpc_urls() -> dict[str, list[str]]:
+        """Endpoints of every chain, as a list per chain."""
+        settings = {
+            'EXPchain': config.expchain_rpc,
+            'Sepolia': config.sepolia_rpc,
+            'BSC': config.bsc_rpc,
+            'Arbitrum': config.arbitrum_rpc,
+        }
+        return {
+            chain: [url for url in endpoints_of(value) if url.startswith(("http://", "https://", "ws://", "wss://"))]
+            for chain, value in settings.items()
+        }
+
+    @staticmethod
+    def _create_web3(chain: str, rpc_urls: list[str]) -> AsyncWeb3:
+        web3 = AsyncWeb3(provider_pool.get_provider(rpc_urls))
+        web3.resource_keys = (chain, resource_limits.host_of(rpc_urls[0]) if len(rpc_urls) == 1 else None)
+        # Read-only: the validation middleware would add an eth_chainId round trip to every eth_call
+        web3.middleware_onion.remove("validation")
+        web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        web3.middleware_onion.add(ResourceLimitMiddleware, name="resource_limits")
+        web3.middleware_onion.add(RequestMetricsMiddleware, name="request_metrics")
+        return web3
+
+    async def _read_chain(self, chain: str, tokens: list[str], addresses: list[str]) -> dict[tuple[str, str], int]:
+        rpc_urls = self._rpc_urls().get(chain)
+        if not rpc_urls:
+            return {}
+
+        multicall = Multicall(self._create_web3(chain, rpc_urls))
+        balances: dict[tuple[str, str], int] = {}
+        for start in range(0, len(addresses), self.batch_size):
+            chunk = addresses[start:start + self.batch_size]
+            try:
+                results = await multicall.balances(chunk, tokens)
+            except Exception as error:
+                await logger.logger_msg(
+                    f"Preflight read on {chain} failed, {len(chunk)} accounts left unchecked: {error}",
+                    type_msg="warning", method_name="_read_chain"
+                )
+                continue
+
+            balances.update(
+                (key, balance) for key, balance in results.items() if isinstance(balance, int)
+            )
+
+        return balances
+
+    async def verify_chains(self) -> None:
+        """Check every configured RPC serves its chain; raises ChainMismatchError otherwise."""
+        async def verify(chain: str, rpc_url: str) -> None:
+            web3 = AsyncWeb3(provider_pool.get_provider(rpc_url))
+            try:
+                await provider_pool.chain_id(rpc_url, web3.eth._chain_id, CHAINS[chain].id)
+            except ChainMismatchError:
+                raise
+            except Exception as error:
+                await logger.logger_msg(
+                    f"Could not check the chain id of the {chain} RPC: {error}",
+                    type_msg="warning", method_name="verify_chains"
+                )
+
+        await asyncio.gather(*(
+            verify(chain, rpc_url) for chain, rpc_urls in self._rpc_urls().items()
+            if chain in CHAINS for rpc_url in rpc_urls
+        ))
+
+    async def _warm_chain(self, chain: str, rpc_urls: list[str], addresses: list[str]) -> None:
+        chain_id = CHAINS[chain].id
+        missing = token_registry.missing(chain_id, addresses)
+        if not missing:
+            return
+
+        web3 = self._create_web3(chain, rpc_urls)
+        erc20_abi = await ERC20Contract().get_abi()
+        calls = []
+        for address in missing:
+            contract = web3.eth.contract(address=web3.to_checksum_address(address), abi=erc20_abi)
+            calls.extend([contract.functions.decimals(), contract.functions.symbol()])
+
+        try:
+            results = await Multicall(web3).aggregate(calls)
+        except Exception as error:
+            await logger.logger_msg(
+                f"Could not read token metadata on {chain}: {error}",
+                type_msg="warning", method_name="warm_token_metadata"
+            )
+            return
+
+        token_registry.update(chain_id, {
+            address: TokenMetadata(decimals=decimals, symbol=symbol)
+            for address, decimals, symbol in zip(missing, results[::2], results[1::2])
+            if isinstance(decimals, int)
+        })
+
+    async def warm_token_metadata(self) -> None:
+        """Read decimals and symbols of all known tokens that are not in the token registry yet."""
+        rpc_urls = self._rpc_urls()
+        tasks = []
+        for chain, chain_config in CHAINS.items():
+            if not rpc_urls.get(chain):
+                continue
+            addresses = list(chain_config.tokens.values())
+            if chain == 'EXPchain':
+                addresses.extend(SWAP_TOKENS.values())
+            addresses = list(dict.fromkeys(address for address in addresses if address != NATIVE))
+            tasks.append(self._warm_chain(chain, rpc_urls[chain], addresses))
+        await asyncio.gather(*tasks)
+
+    async def scan(self, module_name: str, accounts: list[Account]) -> dict[str, str]:
+        """Return {address: reason} for accounts that cannot run the module."""
+        requirement = REQUIREMENTS.get(module_name)
+        if not PREFLIGHT_SCAN or not requirement or not accounts:
+            return {}
+
+        keys, check = requirement
+        addresses = [account.address for account in accounts]
+        tokens_by_chain: dict[str, list[str]] = {}
+        for chain, token in keys:
+            tokens_by_chain.setdefault(chain, []).append(token)
+
+        results = await asyncio.gather(*(
+            self._read_chain(chain, tokens, addresses)
+            for chain, tokens in tokens_by_chain.items()
+        ))
+        chain_balances = dict(zip(tokens_by_chain, results))
+
+        skipped = {}
+        for address in addresses:
+            reason = check({
+                (chain, token): chain_balances[chain][(address, token)]
+                for chain, token in keys if (address, token) in chain_balances[chain]
+            })
+            if reason:
+                skipped[address] = reason
+
+        await self._log_summary(module_name, len(addresses), skipped)
+        return skipped
+
+    @staticmethod
+    async def _log_summary(module_name: str, total: int, skipped: dict[str, str]) -> None:
+        if not skipped:
+            await logger.logger_msg(
+                f"Preflight for '{module_name}': all {total} accounts are eligible", type_msg="info"
+            )
+            return
+
+        reasons: dict[str, int] = {}
+        for reason in skipped.values():
+            reasons[reason] = reasons.get(reason, 0) + 1
+
+        await logger.logger_msg(
+            f"Preflight for '{module_name}': skipping {len(skipped)} of {total} accounts | "
+            + " | ".join(f"{reason}: {count}" for reason, count in reasons.items()),
+            type_msg="warning"
+        )
+
+
+preflight_scanner = PreflightScanner()
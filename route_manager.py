@@ -1,10 +1,13 @@
+import asyncio
 import random
 from typing import Any, Callable
 import sys
 
 from src.models import Account
 from src.logger import AsyncLogger
-from configs import ROUTE_TASK
+from src.utils.concurrency import gather_in_slot, release_slot
+from src.utils.journal import run_journal
+from configs import PARALLEL_ROUTE_TASKS, ROUTE_DEPENDENCIES, ROUTE_TASK
 from src.task_manager import EXPchainBot
 
 logger = AsyncLogger()
@@ -37,7 +40,52 @@ class RouteManager:
         if has_faucet:
             route.insert(0, 'faucet')
             
-        return route
+        return self._order_by_dependencies(route)
+    
+    @staticmethod
+    def get_dependencies(route: list[str]) -> dict[str, set[str]]:
+        return {
+            task: {
+                dependency for dependency in ROUTE_DEPENDENCIES.get(task, ())
+                if dependency in route and dependency != task
+            }
+            for task in route
+        }
+    
+    def _order_by_dependencies(self, route: list[str]) -> list[str]:
+        """Stable topological order: keeps the shuffled order wherever dependencies allow it."""
+        dependencies = self.get_dependencies(route)
+        ordered: list[str] = []
+        remaining = route.copy()
+        
+        while remaining:
+            ready = next(
+                (task for task in remaining if dependencies[task].issubset(ordered)), 
+                None
+            )
+            if ready is None:
+                # Dependency cycle: keep the rest in its current order
+                ordered.extend(remaining)
+                break
+            ordered.append(ready)
+            remaining.remove(ready)
+            
+        return ordered
+    
+    def _has_cycle(self, route: list[str]) -> bool:
+        dependencies = self.get_dependencies(route)
+        resolved: set[str] = set()
+        
+        while len(resolved) < len(route):
+            ready = {
+                task for task in route 
+                if task not in resolved and dependencies[task].issubset(resolved)
+            }
+            if not ready:
+                return True
+            resolved.update(ready)
+            
+        return False
     
     async def validate_route(self, route: list[str]) -> list[str]:
         valid_route = []
@@ -51,34 +99,77 @@ class RouteManager:
                 
         return valid_route
     
+    async def _execute_task(
+        self, 
+        account: Account, 
+        address: str, 
+        task_name: str, 
+        completed: dict[str, dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        if completed.get(task_name, {}).get("success"):
+            await logger.logger_msg(
+                f"Task {task_name} already completed in this run, skipping", 
+                type_msg="info", address=address
+            )
+            return completed[task_name]
+        
+        process_func = self.module_functions.get(task_name)
+        if not process_func:
+            return None
+        
+        try:
+            success, message = await process_func(account)
+            result = {
+                "success": success,
+                "message": message
+            }
+                
+        except Exception as e:
+            error_msg = str(e)
+            await logger.logger_msg(
+                f"Error executing task {task_name}: {error_msg}", type_msg="error"
+            )
+            result = {
+                "success": False,
+                "message": f"Exception: {error_msg}"
+            }
+        
+        run_journal.record_task(address, task_name, result["success"], result["message"])
+        return result
+    
     async def execute_route(self, account: Account, route: list[str]) -> dict[str, Any]:
+        address = account.address
+        completed = run_journal.completed_tasks(address)
+        
+        if not PARALLEL_ROUTE_TASKS or self._has_cycle(route):
+            results = {}
+            for task_name in route:
+                result = await self._execute_task(account, address, task_name, completed)
+                if result is not None:
+                    results[task_name] = result
+            return results
+        
+        dependencies = self.get_dependencies(route)
+        finished = {task: asyncio.Event() for task in route}
         results = {}
         
-        for task_name in route:
+        async def run_when_ready(task_name: str) -> None:
             try:
-                process_func = self.module_functions.get(task_name)
-                if not process_func:
-                    continue
-            
-                
-                success, message = await process_func(account)
-                
-                results[task_name] = {
-                    "success": success,
-                    "message": message
-                }
+                for dependency in dependencies[task_name]:
+                    if not finished[dependency].is_set():
+                        # Waiting on another task counts as sleeping, so the slot can go while all of them sleep
+                        async with release_slot():
+                            await finished[dependency].wait()
                     
-            except Exception as e:
-                error_msg = str(e)
-                await logger.logger_msg(
-                    f"Error executing task {task_name}: {error_msg}", type_msg="error"
-                )
-                results[task_name] = {
-                    "success": False,
-                    "message": f"Exception: {error_msg}"
-                }
-                
-        return results
+                result = await self._execute_task(account, address, task_name, completed)
+                if result is not None:
+                    results[task_name] = result
+            finally:
+                finished[task_name].set()
+        
+        await gather_in_slot(*(run_when_ready(task_name) for task_name in route))
+        
+        return {task: results[task] for task in route if task in results}
 
 
 async def get_optimized_route() -> list[str]:
@@ -94,6 +185,12 @@ async def get_optimized_route() -> list[str]:
     
     valid_route = await route_manager.validate_route(route)
     
+    if PARALLEL_ROUTE_TASKS and route_manager._has_cycle(valid_route):
+        await logger.logger_msg(
+            "ROUTE_DEPENDENCIES contain a cycle, route tasks will run one by one",
+            type_msg="warning"
+        )
+    
     if len(valid_route) != len(route):
         await logger.logger_msg(
             f"Some tasks were excluded from the route. Original: {len(route)}, Valid: {len(valid_route)}",
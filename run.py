@@ -1,21 +1,134 @@
+import argparse
 import asyncio
 import os
 import sys
 
-from module_processor import main_loop
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="EXPchain bot. Without --module the interactive menu is shown."
+    )
+    parser.add_argument(
+        "-m", "--module",
+        help="Module to run without the menu: faucet, bridge_bsc, bridge_sepolia, buy_sepolia, swap, auto_route"
+    )
+    parser.add_argument(
+        "-a", "--accounts",
+        help="Account numbers in accounts.xlsx order, e.g. '1-100,250,300-'"
+    )
+    parser.add_argument(
+        "--address", action="append",
+        help="Only run this wallet address (can be repeated)"
+    )
+    parser.add_argument(
+        "-t", "--threads", type=int,
+        help="Override 'threads' from settings.yaml"
+    )
+    parser.add_argument(
+        "--no-delay", action="store_true",
+        help="Skip 'delay_before_start'"
+    )
+    parser.add_argument(
+        "-p", "--processes", type=int, default=1,
+        help="Split the accounts across this many worker processes (threads are divided between them)"
+    )
+    parser.add_argument(
+        "--coordinator", metavar="ADDR",
+        help="Serve the selected accounts of --module to remote workers on host:port or unix:/path"
+    )
+    parser.add_argument(
+        "--worker", metavar="ADDR",
+        help="Process accounts leased by the coordinator at host:port or unix:/path"
+    )
+    return parser.parse_args()
+
+
+def run_headless(args: argparse.Namespace) -> int:
+    from bot_loader import apply_overrides, config
+    from src.exceptions.custom_exceptions import ConfigurationError
+    from src.models import DelayRange
+    from src.utils import select_accounts
+
+    if args.threads is not None and args.threads < 1:
+        print("❌ Error: --threads must be at least 1")
+        return 2
+    if args.processes < 1:
+        print("❌ Error: --processes must be at least 1")
+        return 2
+
+    try:
+        accounts = select_accounts(config.accounts, args.accounts, args.address)
+    except ConfigurationError as error:
+        print(f"❌ Error: {error}")
+        return 2
+
+    apply_overrides(threads=args.threads, accounts=accounts)
+    if args.no_delay:
+        config.delay_before_start = DelayRange(min=0, max=0)
+
+    if args.coordinator:
+        from cluster_manager import run_coordinator
+        return asyncio.run(run_coordinator(args.module, args.coordinator))
+
+    if args.processes > 1:
+        from shard_manager import run_sharded
+        return asyncio.run(run_sharded(args.module, args.processes, args.no_delay))
+
+    from module_processor import run_module
+    return asyncio.run(run_module(args.module))
+
+
+def run_cluster_worker(args: argparse.Namespace) -> int:
+    from bot_loader import apply_overrides, config
+    from src.models import DelayRange
+
+    if args.threads is not None and args.threads < 1:
+        print("❌ Error: --threads must be at least 1")
+        return 2
+
+    apply_overrides(threads=args.threads)
+    config.send_stats_to_telegram = False
+    if args.no_delay:
+        config.delay_before_start = DelayRange(min=0, max=0)
+
+    from cluster_manager import run_worker
+    return asyncio.run(run_worker(args.worker))
+
+
+def run_interactive() -> int:
+    from module_processor import main_loop
+
+    asyncio.run(main_loop())
+    return 0
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    
     if sys.platform == "win32":
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
     
+    exit_code = 1
     try:
-        asyncio.run(main_loop())
+        if args.coordinator and not args.module:
+            print("❌ Error: --coordinator requires --module")
+            exit_code = 2
+        elif args.worker:
+            exit_code = run_cluster_worker(args)
+        elif args.module:
+            exit_code = run_headless(args)
+        else:
+            exit_code = run_interactive()
     except KeyboardInterrupt:
+        exit_code = 130
         print("\n\n🚨 The program has been stopped. The terminal is ready for commands.")
     except Exception as e:
         print(f"\n\n❌ Error: {str(e)}")
     finally:
-        if sys.platform != "win32":
+        headless = args.module or args.worker or args.coordinator
+        if sys.platform != "win32" and not headless:
             os.system("stty sane")
-        print("👋 The program has ended. The terminal is ready for commands.")
\ No newline at end of file
+        if not headless:
+            print("👋 The program has ended. The terminal is ready for commands.")
+
+    sys.exit(exit_code)
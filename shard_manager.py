@@ -0,0 +1,136 @@
+import asyncio
+import multiprocessing
+import queue
+
+from bot_loader import config, progress
+from module_processor import ModuleProcessor
+from shard_worker import _run_shard
+from src.logger import AsyncLogger
+from src.utils.journal import run_journal
+
+
+logger = AsyncLogger()
+
+
+class ShardManager:
+    """
+    Splits config.accounts across worker processes, each with its own event
+    loop and wallets, and aggregates their results into one set of
+    statistics and one Telegram report.
+    """
+
+    def __init__(self, processes: int, no_delay: bool = False):
+        self.processes = max(1, min(processes, len(config.accounts)))
+        self.no_delay = no_delay
+        self.processor = ModuleProcessor(interactive=False)
+
+    def _split_accounts(self) -> list[list[int]]:
+        shards: list[list[int]] = [[] for _ in range(self.processes)]
+        for position, account in enumerate(config.accounts):
+            shards[position % self.processes].append(account.index)
+        return shards
+
+    def _threads_per_shard(self) -> int:
+        return max(1, config.threads // self.processes)
+
+    async def _collect_results(
+        self,
+        workers: list[multiprocessing.Process],
+        results_queue: multiprocessing.Queue
+    ) -> None:
+        accounts_by_index = {account.index: account for account in config.accounts}
+        seen: set[int] = set()
+
+        while True:
+            try:
+                item = await asyncio.to_thread(results_queue.get, True, 0.5)
+            except queue.Empty:
+                if any(worker.is_alive() for worker in workers):
+                    continue
+                try:
+                    item = results_queue.get(True, 0.1)
+                except queue.Empty:
+                    break
+
+            index, success, message, module, module_results = item
+            account = accounts_by_index.get(index)
+            if account is None:
+                continue
+
+            self.processor.telegram_reporter.add_result(
+                account, success, message, module=module, module_results=module_results
+            )
+            if index not in seen:
+                seen.add(index)
+                await self.processor._update_statistics(success)
+
+    async def run(self, module_name: str) -> int:
+        if module_name not in self.processor.module_functions:
+            await logger.logger_msg(
+                f"Module {module_name} is not implemented! Available: "
+                f"{', '.join(sorted(self.processor.module_functions))}",
+                type_msg="error",
+                method_name="run"
+            )
+            return 2
+
+        config.module = module_name
+        self.processor._initialize_progress_and_reporter(module_name)
+        if run_journal.start_run(module_name):
+            await logger.logger_msg(
+                f"Resuming unfinished '{module_name}' run #{run_journal.run_id}", type_msg="info"
+            )
+
+        context = multiprocessing.get_context("spawn")
+        results_queue = context.Queue()
+        workers = [
+            context.Process(
+                target=_run_shard,
+                args=(
+                    module_name, shard, self._threads_per_shard(),
+                    self.no_delay, run_journal.run_id, results_queue
+                ),
+                name=f"shard-{number}"
+            )
+            for number, shard in enumerate(self._split_accounts(), 1)
+        ]
+
+        await logger.logger_msg(
+            f"Starting {len(workers)} worker processes with {self._threads_per_shard()} threads each",
+            type_msg="info"
+        )
+
+        for worker in workers:
+            worker.start()
+
+        try:
+            await self._collect_results(workers, results_queue)
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            for worker in workers:
+                worker.terminate()
+            raise
+        finally:
+            for worker in workers:
+                await asyncio.to_thread(worker.join)
+
+        crashed = [worker.name for worker in workers if worker.exitcode not in (0, 1)]
+        if crashed:
+            await logger.logger_msg(
+                f"Worker processes ended abnormally: {', '.join(crashed)}. "
+                f"The run stays open and can be resumed",
+                type_msg="error",
+                method_name="run"
+            )
+        else:
+            run_journal.finish_run()
+
+        await self.processor._show_final_stats()
+        run_journal.close()
+
+        if crashed:
+            return 1
+        return 0 if progress.total and progress.success == progress.total else 1
+
+
+async def run_sharded(module_name: str, processes: int, no_delay: bool = False) -> int:
+    return await ShardManager(processes, no_delay).run(module_name)
@@ -0,0 +1,60 @@
+import asyncio
+import multiprocessing
+import sys
+from typing import Any
+
+from src.models import Account
+from src.utils.telegram_reporter import TelegramReporter
+
+
+class QueueReporter(TelegramReporter):
+    """Reporter used inside shard workers: every result is forwarded to the parent process."""
+
+    def __init__(self, results_queue: multiprocessing.Queue):
+        super().__init__()
+        self.results_queue = results_queue
+
+    def add_result(self, account: Account, success: bool, message: str,
+                   module: str = None, module_results: dict[str, Any] = None) -> None:
+        super().add_result(account, success, message, module=module, module_results=module_results)
+        self.results_queue.put((account.index, success, str(message), module, module_results))
+
+    async def send_report(self, report_account: Account) -> None:
+        return
+
+
+# A spawned child imports this module to unpickle _run_shard, so it must not import
+# module_processor: that binds semaphore and progress before apply_overrides sizes them
+def _run_shard(
+    module_name: str,
+    indices: list[int],
+    threads: int,
+    no_delay: bool,
+    run_id: int | None,
+    results_queue: multiprocessing.Queue
+) -> None:
+    from bot_loader import apply_overrides, config
+    from src.models import DelayRange
+
+    wanted = set(indices)
+    apply_overrides(
+        threads=threads,
+        accounts=[account for account in config.accounts if account.index in wanted]
+    )
+    config.send_stats_to_telegram = False
+    if no_delay:
+        config.delay_before_start = DelayRange(min=0, max=0)
+
+    from module_processor import run_module
+    from src.utils.journal import run_journal
+    if run_id is not None:
+        run_journal.attach(run_id)
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    try:
+        exit_code = asyncio.run(run_module(module_name, reporter=QueueReporter(results_queue)))
+    except KeyboardInterrupt:
+        exit_code = 130
+    sys.exit(exit_code)
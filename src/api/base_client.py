@@ -1,6 +1,7 @@
 import asyncio
 import random
 import json
+import time
 import certifi
 import ssl as ssl_module
 from types import TracebackType
@@ -16,6 +17,10 @@ from src.exceptions.api_exceptions import (
     APIRateLimitError, APIResponseError, APIClientSideError, 
     APIServerSideError, APISessionError, APISSLError
 )
+from src.utils.adaptive_concurrency import (
+    adaptive_concurrency, classify_error, classify_http_status
+)
+from src.utils.resource_limiter import resource_limits
 
 
 class BaseAPIClient:
@@ -160,49 +165,54 @@ class BaseAPIClient:
                 if custom_headers:
                     merged_headers.update(custom_headers)
         
+                started = time.monotonic()
                 try:
-                    async with session.request(
-                        method=request_type,
-                        url=target_url,
-                        json=json_data,
-                        data=data,
-                        params=params,
-                        headers=merged_headers,
-                        cookies=cookies,
-                        proxy=self.proxy.as_url if self.proxy else None,
-                        ssl=ssl_param,
-                        allow_redirects=allow_redirects,
-                        raise_for_status=False,
-                        timeout=aiohttp.ClientTimeout(total=timeout)
-                    ) as response:
-                        content_type = response.headers.get('Content-Type', '').lower()
-                        status_code = response.status
+                    async with resource_limits.limit_url(target_url):
+                        started = time.monotonic()
+                        async with session.request(
+                            method=request_type,
+                            url=target_url,
+                            json=json_data,
+                            data=data,
+                            params=params,
+                            headers=merged_headers,
+                            cookies=cookies,
+                            proxy=self.proxy.as_url if self.proxy else None,
+                            ssl=ssl_param,
+                            allow_redirects=allow_redirects,
+                            raise_for_status=False,
+                            timeout=aiohttp.ClientTimeout(total=timeout)
+                        ) as response:
+                            content_type = response.headers.get('Content-Type', '').lower()
+                            status_code = response.status
                         
-                        text = await response.text()
-                        result = {
-                            "status_code": status_code,
-                            "url": str(response.url),
-                            "text": text,
-                            "data": None
-                        }
+                            text = await response.text()
+                            adaptive_concurrency.record(time.monotonic() - started, classify_http_status(status_code))
+                            result = {
+                                "status_code": status_code,
+                                "url": str(response.url),
+                                "text": text,
+                                "data": None
+                            }
                         
-                        try:
-                            if text and ('application/json' in content_type or 'json' in content_type or text.strip().startswith('{')):
-                                result["data"] = json.loads(text)
-                        except json.JSONDecodeError:
-                            pass
+                            try:
+                                if text and ('application/json' in content_type or 'json' in content_type or text.strip().startswith('{')):
+                                    result["data"] = json.loads(text)
+                            except json.JSONDecodeError:
+                                pass
                             
-                        if verify:
-                            if status_code == 429:
-                                raise APIRateLimitError(f"Too many requests: {status_code}")
-                            elif 400 <= status_code < 500:
-                                raise APIClientSideError(f"Client error: {status_code}", status_code, result)
-                            elif status_code >= 500:
-                                raise APIServerSideError(f"Server error: {status_code}", status_code, result)
+                            if verify:
+                                if status_code == 429:
+                                    raise APIRateLimitError(f"Too many requests: {status_code}")
+                                elif 400 <= status_code < 500:
+                                    raise APIClientSideError(f"Client error: {status_code}", status_code, result)
+                                elif status_code >= 500:
+                                    raise APIServerSideError(f"Server error: {status_code}", status_code, result)
                         
-                        return result
+                            return result
                     
                 except asyncio.TimeoutError as e:
+                    adaptive_concurrency.record(time.monotonic() - started, classify_error(e))
                     if attempt < max_retries:
                         delay = random.uniform(*retry_delay) * min(2 ** (attempt - 1), 30)
                         await asyncio.sleep(delay)
@@ -210,6 +220,7 @@ class BaseAPIClient:
                     raise APITimeoutError(f"Request timed out after {timeout} seconds")
                 
                 except aiohttp.ServerTimeoutError as e:
+                    adaptive_concurrency.record(time.monotonic() - started, classify_error(e))
                     if attempt < max_retries:
                         delay = random.uniform(*retry_delay) * min(2 ** (attempt - 1), 30)
                         await asyncio.sleep(delay)
@@ -18,4 +18,12 @@ class ConfigurationError(Exception):
     Base class for configuration errors.
 
     Used for handling errors related to application settings.
-    """
\ No newline at end of file
+    """
+
+
+class ChainMismatchError(ConfigurationError):
+    """
+    Exception for an RPC endpoint serving a different chain than configured.
+
+    Raised before any transaction is signed for that endpoint.
+    """
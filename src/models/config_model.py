@@ -3,6 +3,9 @@ from pathlib import Path
 from typing import Self
 
 from better_proxy import Proxy
+from eth_account import Account as EthAccount
+from eth_account.signers.local import LocalAccount
+from eth_utils import ValidationError as EthValidationError
 from pydantic import (
     BaseModel,
     ConfigDict,
@@ -12,25 +15,81 @@ from pydantic import (
 )
 
 
+EthAccount.enable_unaudited_hdwallet_features()
+
+
 class Account:
     __slots__ = (
         'keypair',
         'proxy',
         'auth_tokens_discord',
+        'index',
+        '_signer',
+        '_private_key',
+        '_address',
     )
 
     def __init__(
         self,
         keypair: str,
         proxy: Proxy | None = None,
-        auth_tokens_discord: str | None = None
+        auth_tokens_discord: str | None = None,
+        index: int | None = None
     ) -> None:
         self.keypair = keypair
         self.proxy = proxy
         self.auth_tokens_discord = auth_tokens_discord
+        self.index = index
+        self._signer: LocalAccount | None = None
+        self._private_key: bytes | None = None
+        self._address: str | None = None
+
     def __repr__(self) -> str:
         return f'Account({self.keypair!r})'
 
+    @staticmethod
+    def derive(keypair: str) -> LocalAccount:
+        """Signer for a 64-character hex private key or a 12/24 word mnemonic."""
+        keypair = keypair.strip()
+
+        key_candidate = keypair.replace(" ", "")
+        key_body = key_candidate[2:] if key_candidate.startswith('0x') else key_candidate
+        if len(key_body) == 64 and all(c in '0123456789abcdefABCDEF' for c in key_body):
+            try:
+                return EthAccount.from_key('0x' + key_body)
+            except ValueError:
+                pass
+
+        words = [word for word in keypair.split() if word]
+        if len(words) in (12, 24):
+            try:
+                return EthAccount.from_mnemonic(' '.join(words))
+            except (ValueError, EthValidationError) as e:
+                raise ValueError(f"Invalid mnemonic phrase: {e}") from e
+        raise ValueError("Input must be a 12 or 24 word mnemonic phrase or a 64-character hexadecimal private key")
+
+    def preload(self, private_key: bytes, address: str) -> None:
+        """Use a key and address derived ahead of time (in bulk at startup) instead of deriving on first use."""
+        self._private_key = private_key
+        self._address = address
+
+    @property
+    def signer(self) -> LocalAccount:
+        # Mnemonics cost a PBKDF2 run: derive once per account, not per module or lookup
+        if self._signer is None:
+            if self._private_key is not None:
+                self._signer = EthAccount.from_key(self._private_key)
+            else:
+                self._signer = self.derive(self.keypair)
+        return self._signer
+
+    @property
+    def address(self) -> str:
+        # Preloaded addresses spare even the public key computation
+        if self._address is None:
+            self._address = self.signer.address
+        return self._address
+
 
 class DelayRange(BaseModel):
     min: int
@@ -57,6 +116,22 @@ class PercentRange(BaseModel):
             raise ValueError('max must be greater than or equal to min')
         return value
 
+class ResourceLimit(BaseModel):
+    concurrency: int = Field(default=0, ge=0)
+    rps: float = Field(default=0, ge=0)
+
+    model_config = ConfigDict(frozen=True)
+
+
+class HDAccounts(BaseModel):
+    mnemonic: str
+    passphrase: str = ""
+    path: str = "m/44'/60'/0'/0/{index}"
+    indexes: str = "0-9"
+
+    model_config = ConfigDict(frozen=True)
+
+
 class Config(BaseModel):
     accounts: list[Account] = Field(default_factory=list)
     threads: int
@@ -65,14 +140,16 @@ class Config(BaseModel):
     tg_token: str = ""
     tg_id: str = ""
     send_stats_to_telegram: bool = False
-    arbitrum_rpc: str = ""
+    arbitrum_rpc: str | list[str] = ""
     arbitrum_explorer: str = ""
-    expchain_rpc: str = ""
+    expchain_rpc: str | list[str] = ""
     expchain_explorer: str = ""
-    sepolia_rpc: str = ""
+    sepolia_rpc: str | list[str] = ""
     sepolia_explorer: str = ""
-    bsc_rpc: str = ""
+    bsc_rpc: str | list[str] = ""
     bsc_explorer: str = ""
+    limits: dict[str, ResourceLimit] = Field(default_factory=dict)
+    hd_accounts: HDAccounts | None = None
     module: str = ""
 
     model_config = ConfigDict(
@@ -77,4 +77,9 @@ class SwapContract(BaseContract):
 @dataclass(slots=True)
 class TestnetBridgeContract(BaseContract):
     address: str = "0xfcA99F4B5186D4bfBDbd2C542dcA2ecA4906BA45"
-    abi_file: str = "buy_sepolia.json"
\ No newline at end of file
+    abi_file: str = "buy_sepolia.json"
+    
+@dataclass(slots=True)
+class Multicall3Contract(BaseContract):
+    address: str = "0xcA11bde05977b3631167028862bE2a173976CA11"
+    abi_file: str = "multicall3.json"
\ No newline at end of file
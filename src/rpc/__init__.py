@@ -0,0 +1,8 @@
+from .websocket import *
+from .failover import *
+from .pool import *
+from .multicall import *
+from .nonce import *
+from .fees import *
+from .tokens import *
+from .receipts import *
@@ -0,0 +1,169 @@
+import asyncio
+import itertools
+import json
+from typing import Any, Awaitable, Callable
+
+import aiohttp
+from web3 import AsyncHTTPProvider
+from web3.providers.rpc.utils import check_if_retry_on_failure
+from web3.types import RPCEndpoint, RPCResponse
+
+from configs import RPC_BATCH_SIZE, RPC_BATCH_WINDOW
+
+
+# Read-only calls that are safe to send together in one JSON-RPC array
+BATCHABLE_METHODS = frozenset({
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_estimateGas",
+    "eth_feeHistory",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByNumber",
+    "eth_getBlockReceipts",
+    "eth_getCode",
+    "eth_getTransactionCount",
+    "eth_getTransactionReceipt",
+    "eth_maxPriorityFeePerGas",
+    "net_version",
+})
+
+
+class RequestBatcher:
+    """
+    Collects JSON-RPC requests to one endpoint for RPC_BATCH_WINDOW seconds
+    (or until RPC_BATCH_SIZE are queued), sends them as a single batch array
+    and hands every response back to the coroutine waiting for it.
+
+    A lone request is sent as a plain object. Endpoints that reject batches
+    are switched to one request per call. A batch gets the longest timeout
+    of the requests in it.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes, float], Awaitable[bytes]],
+        window: float = RPC_BATCH_WINDOW,
+        max_size: int = RPC_BATCH_SIZE
+    ) -> None:
+        self._send_raw = send
+        self.window = window
+        self.max_size = max(1, max_size)
+        self.batching_supported = True
+        self.loop = asyncio.get_running_loop()
+        self._ids = itertools.count(1)
+        self._pending: list[tuple[dict[str, Any], asyncio.Future, float]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, request: dict[str, Any], timeout: float) -> RPCResponse:
+        future = self.loop.create_future()
+        self._pending.append((request, future, timeout))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        if pending:
+            # The loop only keeps weak references to tasks
+            task = self.loop.create_task(self._dispatch(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, pending: list[tuple[dict[str, Any], asyncio.Future, float]]) -> None:
+        if len(pending) == 1 or not self.batching_supported:
+            await asyncio.gather(*(self._send_single(*item) for item in pending))
+            return
+
+        requests: dict[int, tuple[dict[str, Any], asyncio.Future]] = {}
+        payload = []
+        for request, future, _ in pending:
+            batch_id = next(self._ids)
+            requests[batch_id] = (request, future)
+            payload.append({**request, "id": batch_id})
+        timeout = max(timeout for _, _, timeout in pending)
+
+        try:
+            response = json.loads(await self._send_raw(json.dumps(payload).encode(), timeout))
+        except Exception as error:
+            # 400/405/413 reject the batch itself and get the single-request fallback; 429 is a rate limit
+            rejected = (
+                isinstance(error, aiohttp.ClientResponseError)
+                and 400 <= error.status < 500 and error.status != 429
+            )
+            if not rejected:
+                for _, future, _ in pending:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            response = None
+
+        if not isinstance(response, list):
+            # The endpoint does not accept batches: fall back to single requests from now on
+            self.batching_supported = False
+            await asyncio.gather(*(self._send_single(*item) for item in pending))
+            return
+
+        for item in response:
+            request, future = requests.pop(item.get("id"), (None, None))
+            if future is not None and not future.done():
+                future.set_result({**item, "id": request["id"]})
+
+        for request, future in requests.values():
+            if not future.done():
+                future.set_exception(ValueError(f"No response for {request['method']} in JSON-RPC batch"))
+
+    async def _send_single(self, request: dict[str, Any], future: asyncio.Future, timeout: float) -> None:
+        try:
+            response = json.loads(await self._send_raw(json.dumps(request).encode(), timeout))
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            return
+        if not future.done():
+            future.set_result(response)
+
+
+class BatchingHTTPProvider(AsyncHTTPProvider):
+    """
+    HTTP provider that routes read-only calls through a shared RequestBatcher,
+    with the same timeout and exception_retry_configuration as its direct calls.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        get_batcher: Callable[[], RequestBatcher],
+        request_kwargs: dict[str, Any] | None = None,
+        request_timeout: float = 30
+    ) -> None:
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+        self._get_batcher = get_batcher
+        self.request_timeout = request_timeout
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if method not in BATCHABLE_METHODS:
+            return await super().make_request(method, params)
+
+        request = json.loads(self.encode_rpc_request(method, params))
+        retry = self.exception_retry_configuration
+        if retry is None or not check_if_retry_on_failure(method, retry.method_allowlist):
+            return await self._get_batcher().submit(request, self.request_timeout)
+
+        for attempt in range(retry.retries):
+            try:
+                return await self._get_batcher().submit(request, self.request_timeout)
+            except tuple(retry.errors):
+                if attempt == retry.retries - 1:
+                    raise
+                await asyncio.sleep(retry.backoff_factor * 2 ** attempt)
@@ -0,0 +1,340 @@
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3.providers import AsyncBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from configs import (
+    RPC_EJECT_ERRORS, RPC_EJECT_SECONDS, RPC_HEDGE_DELAY,
+    RPC_HEDGE_PERCENTILE, RPC_HEDGING
+)
+from src.exceptions.custom_exceptions import ChainMismatchError
+from .batching import BATCHABLE_METHODS
+from src.utils.adaptive_concurrency import classify_rpc_response
+from src.utils.resource_limiter import resource_limits
+
+
+def endpoints_of(rpc_url: Any) -> list[str]:
+    """Endpoints of an `*_rpc` setting, which is either one URL or a list of them."""
+    if isinstance(rpc_url, (list, tuple)):
+        return [str(url) for url in rpc_url if url]
+    return [str(rpc_url)] if rpc_url else []
+
+
+@dataclass(slots=True)
+class EndpointHealth:
+    url: str
+    latency: float | None = None
+    error_rate: float = 0.0
+    failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    probing: bool = False
+
+    @property
+    def score(self) -> float:
+        # Lower is better: expected latency inflated by the recent error rate
+        return (self.latency or EndpointGroup.DEFAULT_LATENCY) * (1 + 10 * self.error_rate)
+
+
+@dataclass(slots=True)
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=HedgeStats.WINDOW))
+
+    WINDOW = 500
+    MIN_SAMPLES = 20
+    MIN_DELAY = 0.05
+
+    def delay(self, percentile: float = RPC_HEDGE_PERCENTILE, default: float = RPC_HEDGE_DELAY) -> float:
+        """Time after which a read of this method is sent to a second endpoint."""
+        if len(self.latencies) < self.MIN_SAMPLES:
+            return default
+        ordered = sorted(self.latencies)
+        return max(self.MIN_DELAY, ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))])
+
+
+class EndpointGroup:
+    """
+    Health of the RPC endpoints configured for one chain.
+
+    Every request outcome updates an endpoint's rolling latency and error
+    rate. RPC_EJECT_ERRORS failures in a row eject the endpoint for
+    RPC_EJECT_SECONDS (doubling up to MAX_EJECTION on repeat offences);
+    when that time is up it is probed with eth_blockNumber and re-admitted
+    if it answers. Requests go to healthy endpoints at random, weighted by
+    the inverse of their score.
+    """
+    ALPHA = 0.2
+    DEFAULT_LATENCY = 0.5
+    MAX_EJECTION = 600.0
+
+    def __init__(
+        self,
+        urls: list[str],
+        probe: Callable[[str], Awaitable[Any]],
+        eject_errors: int = RPC_EJECT_ERRORS,
+        eject_seconds: float = RPC_EJECT_SECONDS
+    ) -> None:
+        self.urls = urls
+        self.eject_errors = max(1, eject_errors)
+        self.eject_seconds = eject_seconds
+        self._probe = probe
+        self._health = {url: EndpointHealth(url) for url in urls}
+        self._probes: set[asyncio.Task] = set()
+        self.hedge_stats: dict[str, HedgeStats] = {}
+
+    def health(self, url: str) -> EndpointHealth:
+        return self._health[url]
+
+    def select(self, exclude: set[str] = frozenset()) -> str:
+        now = time.monotonic()
+        for health in self._health.values():
+            if health.ejected_until and health.ejected_until <= now and not health.probing:
+                self._start_probe(health)
+
+        candidates = [
+            health for health in self._health.values()
+            if health.url not in exclude and health.ejected_until <= now
+        ]
+        if not candidates:
+            # Everything left is ejected: the one coming back soonest is still better than nothing
+            candidates = sorted(
+                (health for health in self._health.values() if health.url not in exclude),
+                key=lambda health: health.ejected_until
+            )[:1]
+        if not candidates:
+            return self.urls[0]
+
+        weights = [1 / health.score for health in candidates]
+        return random.choices(candidates, weights=weights)[0].url
+
+    def record(self, url: str, latency: float, success: bool) -> None:
+        health = self._health[url]
+        health.error_rate += self.ALPHA * ((0.0 if success else 1.0) - health.error_rate)
+
+        if success:
+            health.latency = latency if health.latency is None else (
+                health.latency + self.ALPHA * (latency - health.latency)
+            )
+            health.failures = 0
+            health.ejections = 0
+            return
+
+        health.failures += 1
+        if health.failures >= self.eject_errors and health.ejected_until <= time.monotonic():
+            self._eject(health)
+
+    def _eject(self, health: EndpointHealth) -> None:
+        health.ejected_until = time.monotonic() + min(
+            self.eject_seconds * 2 ** health.ejections, self.MAX_EJECTION
+        )
+        health.ejections += 1
+
+    def _start_probe(self, health: EndpointHealth) -> None:
+        health.probing = True
+        # The loop only keeps weak references to tasks
+        task = asyncio.get_running_loop().create_task(self._run_probe(health))
+        self._probes.add(task)
+        task.add_done_callback(self._probes.discard)
+
+    async def _run_probe(self, health: EndpointHealth) -> None:
+        started = time.monotonic()
+        try:
+            response = await self._probe(health.url)
+            healthy = classify_rpc_response(response) == "ok"
+        except Exception:
+            healthy = False
+        finally:
+            health.probing = False
+
+        if healthy:
+            health.ejected_until = 0.0
+            health.failures = 0
+            health.error_rate = 0.0
+            health.latency = time.monotonic() - started
+        else:
+            self._eject(health)
+
+
+class FailoverProvider(AsyncBaseProvider):
+    """
+    Provider over several endpoints of one chain.
+
+    Each request goes to an endpoint chosen by the EndpointGroup. Transport
+    errors, timeouts and overload responses are retried on the next endpoint.
+    A transaction re-broadcast after a failed attempt that a node reports as
+    already known counts as sent.
+
+    With RPC_HEDGING on, a read that has not answered within the
+    RPC_HEDGE_PERCENTILE latency of its method is also sent to a second
+    endpoint; the first good response wins and the other request is cancelled.
+
+    Once `expected_chain_id` is set, every endpoint has its chain id checked
+    (via `check_chain`) before it serves its first request; a mismatch is
+    raised instead of failing over.
+    """
+
+    def __init__(
+        self,
+        group: EndpointGroup,
+        providers: dict[str, AsyncBaseProvider],
+        check_chain: Callable[[str, int], Awaitable[int]] | None = None
+    ) -> None:
+        super().__init__()
+        self.group = group
+        self.providers = providers
+        self.expected_chain_id: int | None = None
+        self._check_chain = check_chain
+
+    @property
+    def endpoint_uri(self) -> str:
+        return self.group.urls[0]
+
+    async def _attempt(self, url: str, send: Callable[[AsyncBaseProvider], Awaitable[Any]]) -> Any:
+        async with resource_limits.limit_url(url):
+            started = time.monotonic()
+            try:
+                if self.expected_chain_id is not None and self._check_chain is not None:
+                    await self._check_chain(url, self.expected_chain_id)
+                response = await send(self.providers[url])
+            except Exception:
+                self.group.record(url, time.monotonic() - started, False)
+                raise
+            overloaded = any(
+                classify_rpc_response(item) == "overload"
+                for item in (response if isinstance(response, list) else [response])
+            )
+            self.group.record(url, time.monotonic() - started, not overloaded)
+            return response, overloaded
+
+    async def _failover(
+        self,
+        send: Callable[[AsyncBaseProvider], Awaitable[Any]],
+        tried: set[str] | None = None
+    ) -> tuple[Any, int]:
+        tried = set() if tried is None else tried
+        while True:
+            url = self.group.select(exclude=tried)
+            tried.add(url)
+            last = len(tried) >= len(self.providers)
+            try:
+                response, overloaded = await self._attempt(url, send)
+            except ChainMismatchError:
+                raise
+            except Exception:
+                if last:
+                    raise
+                continue
+            if not overloaded or last:
+                return response, len(tried)
+
+    async def _hedged(self, method: str, send: Callable[[AsyncBaseProvider], Awaitable[Any]]) -> Any:
+        stats = self.group.hedge_stats.setdefault(method, HedgeStats())
+        stats.requests += 1
+
+        first_url = self.group.select()
+        tried = {first_url}
+        tasks: dict[asyncio.Task, str] = {}
+        try:
+            first = asyncio.create_task(self._attempt(first_url, send))
+            first_started = time.monotonic()
+            tasks[first] = first_url
+            done, _ = await asyncio.wait(tasks, timeout=stats.delay())
+
+            if not done:
+                second_url = self.group.select(exclude=tried)
+                if second_url not in tried:
+                    stats.hedged += 1
+                    tried.add(second_url)
+                    tasks[asyncio.create_task(self._attempt(second_url, send))] = second_url
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if isinstance(task.exception(), ChainMismatchError):
+                        raise task.exception()
+                    if task.exception() is not None:
+                        continue
+                    response, overloaded = task.result()
+                    if overloaded:
+                        continue
+                    if task is first or not first.done():
+                        # The first endpoint's own latency; when the hedge wins it is still
+                        # running, so its time so far (never below the hedge delay) stands in
+                        stats.latencies.append(time.monotonic() - first_started)
+                    if task is not first:
+                        stats.hedge_wins += 1
+                    return response
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # No attempt answered: go on with the remaining endpoints like any other request
+        response, _ = await self._failover(send, tried)
+        return response
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if RPC_HEDGING and method in BATCHABLE_METHODS and len(self.providers) > 1:
+            return await self._hedged(method, lambda provider: provider.make_request(method, params))
+
+        response, attempts = await self._failover(lambda provider: provider.make_request(method, params))
+
+        if method == "eth_sendRawTransaction" and attempts > 1 and self._already_known(response):
+            # An earlier attempt reached a node before failing: the transaction is in the mempool
+            return {"jsonrpc": "2.0", "id": response.get("id"), "result": "0x" + keccak(HexBytes(params[0])).hex()}
+        return response
+
+    @staticmethod
+    def _already_known(response: Any) -> bool:
+        error = response.get("error") if isinstance(response, dict) else None
+        return isinstance(error, dict) and "already known" in str(error.get("message", "")).lower()
+
+    async def make_batch_request(self, requests: list[tuple[RPCEndpoint, Any]]) -> list[RPCResponse] | RPCResponse:
+        response, _ = await self._failover(lambda provider: provider.make_batch_request(requests))
+        return response
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        for provider in self.providers.values():
+            if await provider.is_connected(show_traceback):
+                return True
+        return False
+
+    async def disconnect(self) -> None:
+        pass
+
+
+class EndpointRegistry:
+    """One EndpointGroup per list of endpoints, so all wallets share the health data."""
+
+    def __init__(self) -> None:
+        self._groups: dict[tuple[str, ...], EndpointGroup] = {}
+
+    def group_for(self, urls: list[str], probe: Callable[[str], Awaitable[Any]]) -> EndpointGroup:
+        key = tuple(urls)
+        if key not in self._groups:
+            self._groups[key] = EndpointGroup(list(urls), probe)
+        return self._groups[key]
+
+    def hedging_stats(self) -> dict[str, HedgeStats]:
+        """Hedging counters per RPC method, summed over all chains."""
+        totals: dict[str, HedgeStats] = {}
+        for group in self._groups.values():
+            for method, stats in group.hedge_stats.items():
+                total = totals.setdefault(method, HedgeStats())
+                total.requests += stats.requests
+                total.hedged += stats.hedged
+                total.hedge_wins += stats.hedge_wins
+        return totals
+
+
+endpoint_registry = EndpointRegistry()
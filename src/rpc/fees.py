@@ -0,0 +1,107 @@
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+
+from web3 import AsyncWeb3
+
+from configs import FEE_HISTORY_BLOCKS, FEE_PRIORITY_PERCENTILE, FEE_REFRESH_INTERVAL
+
+
+@dataclass(slots=True, frozen=True)
+class FeeSuggestion:
+    eip1559: bool
+    base_fee: int = 0
+    priority_fee: int = 0
+    gas_price: int = 0
+    block_number: int | None = None
+
+
+class ChainFees:
+    """
+    Fee data of one chain, refreshed at most once per FEE_REFRESH_INTERVAL
+    (about one block) by whichever wallet asks first; everyone else is served
+    from memory. EIP-1559 support is checked once and then remembered.
+    """
+
+    def __init__(self, refresh_interval: float = FEE_REFRESH_INTERVAL) -> None:
+        self.refresh_interval = refresh_interval
+        self.eip1559: bool | None = None
+        self._suggestion: FeeSuggestion | None = None
+        self._updated = 0.0
+        self._lock = asyncio.Lock()
+
+    async def supports_eip1559(self, web3: AsyncWeb3) -> bool:
+        if self.eip1559 is None:
+            async with self._lock:
+                if self.eip1559 is None:
+                    latest_block = await web3.eth.get_block('latest')
+                    self.eip1559 = 'baseFeePerGas' in latest_block
+        return self.eip1559
+
+    def _stale(self, web3: AsyncWeb3) -> bool:
+        if self._suggestion is None:
+            return True
+        # WebSocket endpoints following newHeads tell exactly when a new block arrived
+        head_number = getattr(web3.provider, "head_number", None)
+        age = time.monotonic() - self._updated
+        if head_number is not None and self._suggestion.block_number is not None:
+            return head_number > self._suggestion.block_number or age >= self.refresh_interval * 10
+        return age >= self.refresh_interval
+
+    async def suggest(self, web3: AsyncWeb3) -> FeeSuggestion:
+        if self._stale(web3):
+            eip1559 = await self.supports_eip1559(web3)
+            async with self._lock:
+                if self._stale(web3):
+                    self._suggestion = await (self._read_eip1559(web3) if eip1559 else self._read_legacy(web3))
+                    self._updated = time.monotonic()
+        return self._suggestion
+
+    @staticmethod
+    async def _read_legacy(web3: AsyncWeb3) -> FeeSuggestion:
+        return FeeSuggestion(eip1559=False, gas_price=await web3.eth.gas_price)
+
+    @staticmethod
+    async def _read_eip1559(web3: AsyncWeb3) -> FeeSuggestion:
+        try:
+            history = await web3.eth.fee_history(FEE_HISTORY_BLOCKS, 'latest', [FEE_PRIORITY_PERCENTILE])
+        except Exception:
+            # Node without eth_feeHistory: fall back to the latest header and the node's tip suggestion
+            latest_block, priority_fee = await asyncio.gather(
+                web3.eth.get_block('latest'), web3.eth.max_priority_fee
+            )
+            return FeeSuggestion(
+                eip1559=True,
+                base_fee=latest_block['baseFeePerGas'],
+                priority_fee=priority_fee,
+                block_number=latest_block['number']
+            )
+
+        # The last entry is the base fee of the next block
+        base_fee = history['baseFeePerGas'][-1]
+        rewards = [reward[0] for reward in history.get('reward') or [] if reward and reward[0] > 0]
+        # Empty blocks carry no tips: ask the node instead of suggesting zero
+        priority_fee = int(statistics.median(rewards)) if rewards else await web3.eth.max_priority_fee
+
+        return FeeSuggestion(
+            eip1559=True,
+            base_fee=base_fee,
+            priority_fee=priority_fee,
+            block_number=history['oldestBlock'] + len(history['baseFeePerGas']) - 2
+        )
+
+
+class FeeOracle:
+    """One ChainFees per chain, shared by all wallets of the process."""
+
+    def __init__(self) -> None:
+        self._chains: dict[str, ChainFees] = {}
+
+    def for_chain(self, chain_key: str) -> ChainFees:
+        if chain_key not in self._chains:
+            self._chains[chain_key] = ChainFees()
+        return self._chains[chain_key]
+
+
+fee_oracle = FeeOracle()
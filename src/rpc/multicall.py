@@ -0,0 +1,130 @@
+import asyncio
+from typing import Any, ClassVar, Iterable
+
+from eth_utils import get_abi_output_types
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+from web3.contract.async_contract import AsyncContractFunction
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+
+from configs import MULTICALL_BATCH_SIZE, USE_MULTICALL
+from src.models.onchain_model import ERC20Contract, Multicall3Contract
+
+
+NATIVE_TOKEN = "0x0000000000000000000000000000000000000000"
+
+
+class Multicall:
+    """
+    Runs many read-only contract calls as one Multicall3 `aggregate3` call.
+
+    Chains without Multicall3 at the canonical address fall back to plain
+    `eth_call`s, which the RPC batcher still groups into one HTTP request.
+    Calls that revert come back as None; transport errors are raised.
+    """
+    _deployed: ClassVar[dict[str, bool]] = {}
+
+    def __init__(self, web3: AsyncWeb3, batch_size: int = MULTICALL_BATCH_SIZE) -> None:
+        self.web3 = web3
+        self.batch_size = max(1, batch_size)
+        self._contract: AsyncContract | None = None
+
+    async def _get_contract(self) -> AsyncContract:
+        if self._contract is None:
+            multicall = Multicall3Contract()
+            self._contract = self.web3.eth.contract(
+                address=self.web3.to_checksum_address(multicall.address),
+                abi=await multicall.get_abi()
+            )
+        return self._contract
+
+    async def available(self) -> bool:
+        if not USE_MULTICALL:
+            return False
+
+        endpoint = str(getattr(self.web3.provider, "endpoint_uri", ""))
+        if endpoint not in self._deployed:
+            try:
+                code = await self.web3.eth.get_code(
+                    self.web3.to_checksum_address(Multicall3Contract().address)
+                )
+                self._deployed[endpoint] = len(code) > 0
+            except Exception:
+                return False
+        return self._deployed[endpoint]
+
+    @staticmethod
+    def _decode(call: AsyncContractFunction, data: bytes) -> Any:
+        values = call.w3.codec.decode(get_abi_output_types(call.abi), data)
+        return values[0] if len(values) == 1 else tuple(values)
+
+    async def aggregate(self, calls: list[AsyncContractFunction]) -> list[Any]:
+        if not calls:
+            return []
+        if not await self.available():
+            return await self._call_each(calls)
+
+        contract = await self._get_contract()
+        chunks = [calls[start:start + self.batch_size] for start in range(0, len(calls), self.batch_size)]
+        raw_results = await asyncio.gather(*(
+            contract.functions.aggregate3([
+                (call.address, True, call._encode_transaction_data()) for call in chunk
+            ]).call()
+            for chunk in chunks
+        ))
+
+        results = []
+        for chunk, raw in zip(chunks, raw_results):
+            for call, (success, data) in zip(chunk, raw):
+                try:
+                    results.append(self._decode(call, data) if success and data else None)
+                except Exception:
+                    results.append(None)
+        return results
+
+    @staticmethod
+    async def _call_or_none(call: AsyncContractFunction) -> Any:
+        try:
+            return await call.call()
+        except (ContractLogicError, BadFunctionCallOutput):
+            return None
+
+    async def _call_each(self, calls: list[AsyncContractFunction]) -> list[Any]:
+        return list(await asyncio.gather(*(self._call_or_none(call) for call in calls)))
+
+    async def balances(
+        self,
+        owners: Iterable[str],
+        tokens: Iterable[str]
+    ) -> dict[tuple[str, str], int | None]:
+        """Native (zero address) and ERC20 balances for every owner/token pair in one go."""
+        owners = [self.web3.to_checksum_address(owner) for owner in owners]
+        tokens = list(tokens)
+        keys = [(owner, token) for owner in owners for token in tokens]
+
+        use_multicall = await self.available()
+        erc20_abi = await ERC20Contract().get_abi()
+        contracts = {
+            token: self.web3.eth.contract(address=self.web3.to_checksum_address(token), abi=erc20_abi)
+            for token in tokens if token != NATIVE_TOKEN
+        }
+
+        calls = []
+        native_keys: list[tuple[str, str]] = []
+        for owner, token in keys:
+            if token != NATIVE_TOKEN:
+                calls.append(contracts[token].functions.balanceOf(owner))
+            elif use_multicall:
+                calls.append((await self._get_contract()).functions.getEthBalance(owner))
+            else:
+                native_keys.append((owner, token))
+
+        skipped = set(native_keys)
+        call_keys = [key for key in keys if key not in skipped]
+        results = dict(zip(call_keys, await self.aggregate(calls)))
+
+        if native_keys:
+            native = await asyncio.gather(*(self.web3.eth.get_balance(owner) for owner, _ in native_keys))
+            results.update(zip(native_keys, native))
+
+        return {key: results.get(key) for key in keys}
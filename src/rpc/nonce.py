@@ -0,0 +1,81 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from web3.types import Nonce
+
+
+NonceKey = tuple[str, str]
+FetchNonce = Callable[[], Awaitable[int]]
+
+
+class NonceManager:
+    """
+    Hands out nonces per (chain, address) from memory.
+
+    The pending transaction count is read once; after that every
+    transaction built for the account takes the next number locally, so
+    several transactions of one account can be built and sent back to back.
+    The counter is re-read only when a node reports a nonce error or a
+    transaction gets stuck. Nonces given back while later ones are still
+    out are kept as gaps and handed out again first, lowest first.
+    """
+
+    def __init__(self) -> None:
+        self._next: dict[NonceKey, int] = {}
+        self._gaps: dict[NonceKey, set[int]] = {}
+        self._locks: dict[NonceKey, asyncio.Lock] = {}
+
+    def _lock(self, key: NonceKey) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    async def reserve(self, key: NonceKey, fetch: FetchNonce) -> Nonce:
+        async with self._lock(key):
+            if key not in self._next:
+                self._next[key] = await fetch()
+            gaps = self._gaps.get(key)
+            if gaps:
+                nonce = min(gaps)
+                gaps.discard(nonce)
+                return Nonce(nonce)
+            nonce = self._next[key]
+            self._next[key] = nonce + 1
+            return Nonce(nonce)
+
+    async def resync(self, key: NonceKey, fetch: FetchNonce, used: int | None = None) -> Nonce:
+        """Re-read the pending count after a nonce error and reserve a fresh nonce."""
+        async with self._lock(key):
+            nonce = await fetch()
+            if used is not None and nonce <= used:
+                nonce = used + 1
+            self._next[key] = max(nonce + 1, self._next.get(key, 0))
+            # Gaps below the pending count were filled by transactions the node already has
+            gaps = self._gaps.get(key)
+            if gaps:
+                gaps.difference_update(range(min(gaps), nonce + 1))
+            return Nonce(nonce)
+
+    def release(self, key: NonceKey, nonce: int) -> None:
+        """Give back a nonce whose transaction was never broadcast."""
+        next_nonce = self._next.get(key)
+        if next_nonce is None or nonce >= next_nonce:
+            return
+        gaps = self._gaps.setdefault(key, set())
+        if nonce + 1 == next_nonce:
+            # The highest nonce issued: rewind, together with any gaps now on top
+            next_nonce = nonce
+            while next_nonce - 1 in gaps:
+                next_nonce -= 1
+                gaps.discard(next_nonce)
+            self._next[key] = next_nonce
+        else:
+            # Later nonces are already out: keep this one as a gap for the next reserve
+            gaps.add(nonce)
+
+    def invalidate(self, key: NonceKey) -> None:
+        self._next.pop(key, None)
+        self._gaps.pop(key, None)
+
+
+nonce_manager = NonceManager()
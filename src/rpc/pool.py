@@ -0,0 +1,250 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from better_proxy import Proxy
+from web3 import AsyncHTTPProvider
+from web3._utils.http_session_manager import HTTPSessionManager
+
+from configs import RPC_BATCHING, RPC_POOL_CONNECTIONS, RPC_POOL_IDLE_TIMEOUT, RPC_POOL_KEEPALIVE
+from src.exceptions.custom_exceptions import ChainMismatchError
+from .batching import BatchingHTTPProvider, RequestBatcher
+from .failover import FailoverProvider, endpoint_registry, endpoints_of
+from .websocket import SharedWebSocketProvider, WebSocketConnection
+
+
+PoolKey = tuple[str, str | None]
+
+
+@dataclass(slots=True)
+class PoolEntry:
+    session: ClientSession
+    loop: asyncio.AbstractEventLoop
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class PooledSessionManager(HTTPSessionManager):
+    """
+    Session manager of a pooled provider: instead of caching a session of
+    its own it asks the pool for the shared one, so `disconnect()` on the
+    provider leaves the keep-alive connections open for other wallets.
+    """
+
+    def __init__(self, pool: "ProviderPool", key: PoolKey) -> None:
+        super().__init__()
+        self._pool = pool
+        self._key = key
+
+    async def async_cache_and_return_session(
+        self,
+        endpoint_uri,
+        session: ClientSession | None = None,
+        request_timeout: ClientTimeout | None = None
+    ) -> ClientSession:
+        return await self._pool.session_for(self._key)
+
+
+class ProviderPool:
+    """
+    Process-wide keep-alive connection pools for RPC endpoints, one per
+    (rpc_url, proxy) pair.
+
+    Every wallet still gets its own lightweight provider, but all providers
+    for the same endpoint and proxy share one aiohttp session capped at
+    RPC_POOL_CONNECTIONS connections. Pools unused for RPC_POOL_IDLE_TIMEOUT
+    seconds are closed.
+
+    With RPC_BATCHING on, read-only calls of all those providers also share
+    one RequestBatcher per pool. A list of endpoints gives a FailoverProvider
+    over one pooled provider per endpoint. ws:// and wss:// endpoints get one
+    shared WebSocketConnection per pool instead of HTTP requests.
+
+    The chain id of every endpoint is asked once, checked against the
+    configured chain and then served from memory.
+    """
+
+    def __init__(
+        self,
+        connections: int = RPC_POOL_CONNECTIONS,
+        keepalive: float = RPC_POOL_KEEPALIVE,
+        idle_timeout: float = RPC_POOL_IDLE_TIMEOUT
+    ) -> None:
+        self.connections = connections
+        self.keepalive = keepalive
+        self.idle_timeout = idle_timeout
+        self._entries: dict[PoolKey, PoolEntry] = {}
+        self._batchers: dict[PoolKey, RequestBatcher] = {}
+        self._sockets: dict[PoolKey, WebSocketConnection] = {}
+        self._chain_ids: dict[str, int] = {}
+        self._chain_id_locks: dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def key_of(rpc_url: str, proxy: Proxy | str | None = None) -> PoolKey:
+        proxy_url = proxy.as_url if isinstance(proxy, Proxy) else proxy
+        return str(rpc_url), proxy_url or None
+
+    def get_provider(
+        self,
+        rpc_url: str | list[str],
+        proxy: Proxy | str | None = None,
+        request_timeout: int = 30
+    ) -> AsyncHTTPProvider | FailoverProvider:
+        urls = endpoints_of(rpc_url)
+        if len(urls) > 1:
+            providers = {url: self._get_provider(url, proxy, request_timeout) for url in urls}
+            for provider in providers.values():
+                # FailoverProvider retries on the next endpoint instead
+                provider.exception_retry_configuration = None
+            return FailoverProvider(
+                endpoint_registry.group_for(urls, self._probe),
+                providers,
+                lambda url, expected: self.chain_id(url, lambda: self._fetch_chain_id(providers[url]), expected)
+            )
+        return self._get_provider(urls[0] if urls else str(rpc_url), proxy, request_timeout)
+
+    @staticmethod
+    async def _fetch_chain_id(provider: AsyncHTTPProvider | SharedWebSocketProvider) -> int:
+        response = await provider.make_request("eth_chainId", [])
+        if "error" in response:
+            raise ValueError(f"eth_chainId failed: {response['error']}")
+        return int(response["result"], 16)
+
+    async def _probe(self, rpc_url: str) -> dict:
+        return await self._get_provider(rpc_url, None, 10).make_request("eth_blockNumber", [])
+
+    def _get_provider(
+        self,
+        rpc_url: str,
+        proxy: Proxy | str | None = None,
+        request_timeout: int = 30
+    ) -> AsyncHTTPProvider | SharedWebSocketProvider:
+        key = self.key_of(rpc_url, proxy)
+        if key[0].startswith(("ws://", "wss://")):
+            return SharedWebSocketProvider(key[0], lambda: self.socket_for(key), request_timeout)
+
+        request_kwargs = {
+            "proxy": key[1],
+            "timeout": ClientTimeout(total=request_timeout)
+        }
+        if RPC_BATCHING:
+            provider = BatchingHTTPProvider(
+                key[0], lambda: self.batcher_for(key), request_kwargs=request_kwargs, request_timeout=request_timeout
+            )
+        else:
+            provider = AsyncHTTPProvider(key[0], request_kwargs=request_kwargs)
+        provider._request_session_manager = PooledSessionManager(self, key)
+        return provider
+
+    def batcher_for(self, key: PoolKey) -> RequestBatcher:
+        batcher = self._batchers.get(key)
+        if batcher is None or batcher.loop is not asyncio.get_running_loop():
+            batcher = self._batchers[key] = RequestBatcher(
+                lambda data, timeout: self.post(key, data, timeout)
+            )
+        return batcher
+
+    def socket_for(self, key: PoolKey) -> WebSocketConnection:
+        socket = self._sockets.get(key)
+        if socket is None or socket.loop is not asyncio.get_running_loop():
+            socket = self._sockets[key] = WebSocketConnection(
+                key[0], lambda: self.session_for(key), key[1]
+            )
+        if key in self._entries:
+            # An open socket keeps its pool entry from being evicted as idle
+            self._entries[key].last_used = time.monotonic()
+        return socket
+
+    async def post(self, key: PoolKey, data: bytes, timeout: float = 30) -> bytes:
+        session = await self.session_for(key)
+        async with session.post(
+            key[0],
+            data=data,
+            proxy=key[1],
+            headers={"Content-Type": "application/json"},
+            timeout=ClientTimeout(total=timeout)
+        ) as response:
+            return await response.read()
+
+    async def chain_id(
+        self,
+        rpc_url: str,
+        fetch: Callable[[], Awaitable[int]],
+        expected: int | None = None
+    ) -> int:
+        rpc_url = str(rpc_url)
+        if rpc_url not in self._chain_ids:
+            lock = self._chain_id_locks.setdefault(rpc_url, asyncio.Lock())
+            async with lock:
+                if rpc_url not in self._chain_ids:
+                    self._chain_ids[rpc_url] = int(await fetch())
+
+        chain_id = self._chain_ids[rpc_url]
+        if expected is not None and chain_id != expected:
+            raise ChainMismatchError(
+                f"RPC {rpc_url} serves chain id {chain_id}, expected {expected}. Check the *_rpc settings"
+            )
+        return chain_id
+
+    def _create_session(self) -> ClientSession:
+        return ClientSession(
+            raise_for_status=True,
+            connector=TCPConnector(
+                limit=self.connections,
+                keepalive_timeout=self.keepalive,
+                ssl=False,
+                enable_cleanup_closed=True
+            )
+        )
+
+    async def session_for(self, key: PoolKey) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        self._evict_idle(now, keep=key)
+
+        entry = self._entries.get(key)
+        if entry is None or entry.session.closed or entry.loop is not loop:
+            if entry is not None and not entry.session.closed and not entry.loop.is_closed():
+                entry.loop.create_task(entry.session.close())
+            entry = self._entries[key] = PoolEntry(self._create_session(), loop)
+
+        entry.last_used = now
+        return entry.session
+
+    def _evict_idle(self, now: float, keep: PoolKey) -> None:
+        idle = [
+            key for key, entry in self._entries.items()
+            if key != keep and now - entry.last_used > self.idle_timeout
+        ]
+        for key in idle:
+            self._batchers.pop(key, None)
+            socket = self._sockets.pop(key, None)
+            if socket is not None and not socket.loop.is_closed():
+                socket.loop.create_task(socket.close())
+            entry = self._entries.pop(key)
+            if not entry.session.closed and not entry.loop.is_closed():
+                entry.loop.create_task(entry.session.close())
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    async def close(self) -> None:
+        entries, self._entries = list(self._entries.values()), {}
+        sockets, self._sockets = list(self._sockets.values()), {}
+        self._batchers.clear()
+        loop = asyncio.get_running_loop()
+        for socket in sockets:
+            if socket.loop is loop:
+                await socket.close()
+        for entry in entries:
+            if entry.session.closed:
+                continue
+            if entry.loop is loop:
+                await entry.session.close()
+            elif not entry.loop.is_closed():
+                entry.loop.create_task(entry.session.close())
+
+
+provider_pool = ProviderPool()
@@ -0,0 +1,176 @@
+import asyncio
+from typing import Any
+
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.exceptions import BlockNotFound, TransactionNotFound
+from web3.types import TxReceipt
+
+from configs import RECEIPT_POLL_INTERVAL
+
+
+# Past this many new blocks per poll, looking up the pending hashes is cheaper than reading whole blocks
+MAX_BLOCKS_PER_POLL = 10
+
+
+class ChainReceiptWatcher:
+    """
+    Waits for the receipts of all transactions sent on one chain.
+
+    A single task follows eth_blockNumber while anything is pending (or the
+    `newHeads` subscription on WebSocket endpoints). Each new
+    block is resolved with one eth_getBlockReceipts call per block where the
+    node supports it, otherwise with one batched eth_getTransactionReceipt per
+    pending hash. Hashes registered since the previous block are always looked
+    up directly, in case they were mined before the watcher saw them.
+    """
+
+    def __init__(self, poll_interval: float = RECEIPT_POLL_INTERVAL) -> None:
+        self.poll_interval = poll_interval
+        self.block_receipts_supported: bool | None = None
+        self.loop = asyncio.get_running_loop()
+        self._web3: AsyncWeb3 | None = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._waiters: dict[str, int] = {}
+        self._fresh: set[str] = set()
+        self._last_block: int | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def wait(self, web3: AsyncWeb3, tx_hash: HexBytes | str) -> TxReceipt:
+        tx_hash = HexBytes(tx_hash).to_0x_hex()
+        self._web3 = web3
+
+        future = self._pending.get(tx_hash)
+        if future is None:
+            future = self._pending[tx_hash] = self.loop.create_future()
+            self._fresh.add(tx_hash)
+        self._waiters[tx_hash] = self._waiters.get(tx_hash, 0) + 1
+
+        if self._task is None or self._task.done():
+            self._task = self.loop.create_task(self._run())
+
+        try:
+            # Shielded so a timed-out waiter does not cancel the result for others
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[tx_hash] -= 1
+            if not self._waiters[tx_hash]:
+                del self._waiters[tx_hash]
+                self._pending.pop(tx_hash, None)
+                self._fresh.discard(tx_hash)
+
+    async def _run(self) -> None:
+        while self._pending:
+            try:
+                await self._poll()
+            except Exception:
+                # Transient RPC errors: waiters time out on their own if the node stays down
+                pass
+            if self._pending:
+                await self._wait_for_block()
+        self._last_block = None
+
+    async def _wait_for_block(self) -> None:
+        await asyncio.sleep(self.poll_interval)
+        next_head = getattr(self._web3.provider, "next_head", None)
+        if next_head is None:
+            return
+        try:
+            # WebSocket endpoints: sleep until newHeads reports a block we have not seen
+            await next_head(self._last_block, timeout=self.poll_interval * 10)
+        except Exception:
+            pass
+
+    async def _poll(self) -> None:
+        web3 = self._web3
+        block_number = await web3.eth.block_number
+        new_blocks = (
+            [] if self._last_block is None
+            else list(range(self._last_block + 1, block_number + 1))
+        )
+        if not new_blocks and not self._fresh and self._last_block is not None:
+            return
+
+        fresh, self._fresh = self._fresh, set()
+        last_block = block_number
+        if new_blocks and len(new_blocks) <= MAX_BLOCKS_PER_POLL and self.block_receipts_supported is not False:
+            resolved = await self._resolve_blocks(web3, new_blocks)
+            if resolved == len(new_blocks):
+                lookup = fresh
+            else:
+                # Unread blocks are read again next poll; meanwhile look every pending hash up
+                last_block = self._last_block + resolved
+                lookup = set(self._pending)
+        elif new_blocks or self._last_block is None:
+            lookup = set(self._pending)
+        else:
+            lookup = fresh
+
+        self._last_block = last_block
+        await self._resolve_hashes(web3, [tx_hash for tx_hash in lookup if tx_hash in self._pending])
+
+    async def _resolve_blocks(self, web3: AsyncWeb3, blocks: list[int]) -> int:
+        """Resolve the receipts of consecutive blocks, returning how many leading blocks were read."""
+        results = await asyncio.gather(
+            *(web3.eth.get_block_receipts(block) for block in blocks),
+            return_exceptions=True
+        )
+        if self.block_receipts_supported is None:
+            # A missing block (null result) is not an unsupported method
+            if all(isinstance(receipts, Exception) and not isinstance(receipts, BlockNotFound) for receipts in results):
+                self.block_receipts_supported = False
+                return 0
+            self.block_receipts_supported = True
+
+        first_unread = len(blocks)
+        for position, receipts in enumerate(results):
+            # null (BlockNotFound) comes from a backend that has not seen the block yet: it is not an empty block
+            if receipts is None or isinstance(receipts, Exception):
+                first_unread = min(first_unread, position)
+                continue
+            for receipt in receipts:
+                self._resolve(HexBytes(receipt["transactionHash"]).to_0x_hex(), receipt)
+        return first_unread
+
+    async def _resolve_hashes(self, web3: AsyncWeb3, hashes: list[str]) -> None:
+        results = await asyncio.gather(
+            *(web3.eth.get_transaction_receipt(tx_hash) for tx_hash in hashes),
+            return_exceptions=True
+        )
+        for tx_hash, receipt in zip(hashes, results):
+            # Not mined yet (None/TransactionNotFound): a later block or lookup will find it
+            if receipt is None or isinstance(receipt, TransactionNotFound):
+                continue
+            if isinstance(receipt, Exception):
+                # Failed lookup: block reads may never cover this hash, so look it up again next poll
+                self._fresh.add(tx_hash)
+                continue
+            self._resolve(tx_hash, receipt)
+
+    def _resolve(self, tx_hash: str, receipt: Any) -> None:
+        future = self._pending.get(tx_hash)
+        if future is not None and not future.done():
+            future.set_result(receipt)
+
+
+class ReceiptWatcher:
+    """One ChainReceiptWatcher per chain, shared by all wallets of the process."""
+
+    def __init__(self) -> None:
+        self._chains: dict[str, ChainReceiptWatcher] = {}
+
+    def for_chain(self, chain_key: str) -> ChainReceiptWatcher:
+        watcher = self._chains.get(chain_key)
+        if watcher is None or watcher.loop is not asyncio.get_running_loop():
+            watcher = self._chains[chain_key] = ChainReceiptWatcher()
+        return watcher
+
+    async def wait(self, chain_key: str, web3: AsyncWeb3, tx_hash: HexBytes | str) -> TxReceipt:
+        return await self.for_chain(chain_key).wait(web3, tx_hash)
+
+
+receipt_watcher = ReceiptWatcher()
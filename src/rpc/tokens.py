@@ -0,0 +1,91 @@
+import asyncio
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+
+TOKEN_METADATA_PATH = Path(__file__).parent.parent.parent / "config" / "data" / "token_metadata.json"
+
+TokenKey = tuple[int, str]
+
+
+@dataclass(slots=True, frozen=True)
+class TokenMetadata:
+    decimals: int
+    symbol: str | None = None
+
+
+class TokenRegistry:
+    """
+    Decimals and symbols of ERC20 tokens keyed by (chain_id, address),
+    shared by all wallets and kept in config/data/token_metadata.json so
+    they are read from the chain once, not once per account and run.
+    """
+
+    def __init__(self, path: str | Path = TOKEN_METADATA_PATH) -> None:
+        self.path = Path(path)
+        self._tokens: dict[TokenKey, TokenMetadata] | None = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _key(chain_id: int, address: str) -> TokenKey:
+        return int(chain_id), address.lower()
+
+    def _load(self) -> dict[TokenKey, TokenMetadata]:
+        if self._tokens is None:
+            self._tokens = {}
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                for chain_id, tokens in data.items():
+                    for address, metadata in tokens.items():
+                        self._tokens[self._key(int(chain_id), address)] = TokenMetadata(**metadata)
+            except (OSError, ValueError, TypeError):
+                pass
+        return self._tokens
+
+    def _save(self) -> None:
+        data: dict[str, dict[str, dict]] = {}
+        for (chain_id, address), metadata in sorted(self._load().items()):
+            data.setdefault(str(chain_id), {})[address] = asdict(metadata)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One temp file per write: shard processes may save at the same time
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.path.parent, prefix=self.path.name, suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_file.write(json.dumps(data, indent=2))
+        try:
+            os.replace(temp_file.name, self.path)
+        except OSError:
+            os.unlink(temp_file.name)
+            raise
+
+    def get(self, chain_id: int, address: str) -> TokenMetadata | None:
+        return self._load().get(self._key(chain_id, address))
+
+    def missing(self, chain_id: int, addresses: list[str]) -> list[str]:
+        return [address for address in addresses if self.get(chain_id, address) is None]
+
+    def update(self, chain_id: int, tokens: dict[str, TokenMetadata]) -> None:
+        if not tokens:
+            return
+        registry = self._load()
+        for address, metadata in tokens.items():
+            registry[self._key(chain_id, address)] = metadata
+        self._save()
+
+    async def decimals(self, chain_id: int, address: str, fetch: Callable[[], Awaitable[int]]) -> int:
+        metadata = self.get(chain_id, address)
+        if metadata is None:
+            async with self._lock:
+                metadata = self.get(chain_id, address)
+                if metadata is None:
+                    metadata = TokenMetadata(decimals=int(await fetch()))
+                    self.update(chain_id, {address: metadata})
+        return metadata.decimals
+
+
+token_registry = TokenRegistry()
@@ -0,0 +1,240 @@
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, Awaitable, Callable, Coroutine
+
+import aiohttp
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from configs import WS_HEARTBEAT
+
+
+Notification = Callable[[Any], None]
+
+
+class WebSocketConnection:
+    """
+    One long-lived WebSocket to an RPC endpoint shared by every wallet.
+
+    Requests from many accounts are multiplexed over it by JSON-RPC id and
+    subscription notifications are routed to their callbacks. A dropped
+    connection fails the requests in flight, is re-opened on the next request
+    (with a growing back-off after failed attempts) and restores its
+    subscriptions.
+    """
+    RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+
+    def __init__(
+        self,
+        url: str,
+        get_session: Callable[[], Awaitable[aiohttp.ClientSession]],
+        proxy: str | None = None
+    ) -> None:
+        self.url = url
+        self.proxy = proxy
+        self.loop = asyncio.get_running_loop()
+        self.latest_head: dict | None = None
+        self._get_session = get_session
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._subscriptions: dict[str, tuple[list, Notification]] = {}
+        self._connect_lock = asyncio.Lock()
+        self._failures = 0
+        self._retry_at = 0.0
+        self._heads_subscribed = False
+        self._head_waiter: asyncio.Future | None = None
+        self._closed = False
+        self._tasks: set[asyncio.Task] = set()
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        # The loop only keeps weak references to tasks
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def _ensure_connected(self) -> None:
+        if self.connected:
+            return
+
+        async with self._connect_lock:
+            if self.connected:
+                return
+            if self._closed:
+                raise ConnectionError(f"WebSocket {self.url} is closed")
+            if time.monotonic() < self._retry_at:
+                raise ConnectionError(f"WebSocket {self.url} is reconnecting")
+
+            try:
+                session = await self._get_session()
+                ws = await session.ws_connect(
+                    self.url, proxy=self.proxy, heartbeat=WS_HEARTBEAT, max_msg_size=0
+                )
+            except Exception:
+                delay = self.RECONNECT_DELAYS[min(self._failures, len(self.RECONNECT_DELAYS) - 1)]
+                self._failures += 1
+                self._retry_at = time.monotonic() + delay
+                raise
+
+            self._failures = 0
+            self._ws = ws
+            self._spawn(self._read(ws))
+            subscriptions, self._subscriptions = self._subscriptions, {}
+
+        for params, callback in subscriptions.values():
+            try:
+                await self.subscribe(params, callback)
+            except Exception:
+                if callback == self._on_head:
+                    self._heads_subscribed = False
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        try:
+            async for message in ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    data = json.loads(message.data)
+                    for item in data if isinstance(data, list) else [data]:
+                        self._dispatch(item)
+                elif message.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSE):
+                    break
+        except Exception:
+            pass
+        finally:
+            if self._ws is ws:
+                self._ws = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"WebSocket connection to {self.url} closed"))
+            if self._subscriptions and not self._closed:
+                self._spawn(self._resume())
+
+    async def _resume(self) -> None:
+        # Nobody may send a request soon: reconnect on our own so subscriptions keep flowing
+        while self._subscriptions and not self._closed and not self.connected:
+            try:
+                await self._ensure_connected()
+            except Exception:
+                await asyncio.sleep(max(0.0, self._retry_at - time.monotonic()) or 1)
+
+    def _dispatch(self, message: dict) -> None:
+        if message.get("method") == "eth_subscription":
+            params = message.get("params") or {}
+            subscription = self._subscriptions.get(params.get("subscription"))
+            if subscription:
+                subscription[1](params.get("result"))
+            return
+
+        future = self._pending.get(message.get("id"))
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    async def request(self, request: dict[str, Any], timeout: float = 30) -> RPCResponse:
+        """Send a JSON-RPC request object and return the response with the caller's id."""
+        await self._ensure_connected()
+        request_id = next(self._ids)
+        future = self.loop.create_future()
+        self._pending[request_id] = future
+        try:
+            await self._ws.send_str(json.dumps({**request, "id": request_id}))
+            response = await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        return {**response, "id": request.get("id")}
+
+    async def subscribe(self, params: list, callback: Notification) -> str:
+        response = await self.request({"jsonrpc": "2.0", "method": "eth_subscribe", "params": params})
+        if "error" in response:
+            raise ValueError(f"eth_subscribe {params} failed: {response['error']}")
+        subscription_id = response["result"]
+        self._subscriptions[subscription_id] = (params, callback)
+        return subscription_id
+
+    async def unsubscribe(self, subscription_id: str) -> None:
+        if self._subscriptions.pop(subscription_id, None) and self.connected:
+            await self.request({"jsonrpc": "2.0", "method": "eth_unsubscribe", "params": [subscription_id]})
+
+    def _on_head(self, head: Any) -> None:
+        if not isinstance(head, dict):
+            return
+        self.latest_head = head
+        if self._head_waiter is not None and not self._head_waiter.done():
+            self._head_waiter.set_result(head)
+        self._head_waiter = None
+
+    @property
+    def head_number(self) -> int | None:
+        return int(self.latest_head["number"], 16) if self.latest_head else None
+
+    async def next_head(self, after: int | None = None, timeout: float = 30) -> dict | None:
+        """Latest `newHeads` header, waiting up to `timeout` for one newer than block `after`."""
+        if not self._heads_subscribed:
+            self._heads_subscribed = True
+            try:
+                await self.subscribe(["newHeads"], self._on_head)
+            except Exception:
+                self._heads_subscribed = False
+                raise
+
+        if self.latest_head is not None and (after is None or self.head_number > after):
+            return self.latest_head
+
+        if self._head_waiter is None or self._head_waiter.done():
+            self._head_waiter = self.loop.create_future()
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._head_waiter), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self._closed = True
+        self._subscriptions.clear()
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+
+
+class SharedWebSocketProvider(AsyncJSONBaseProvider):
+    """Lightweight per-wallet provider sending its requests over a shared WebSocketConnection."""
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        get_connection: Callable[[], WebSocketConnection],
+        request_timeout: float = 30
+    ) -> None:
+        super().__init__()
+        self.endpoint_uri = endpoint_uri
+        self.request_timeout = request_timeout
+        self.exception_retry_configuration = None
+        self._get_connection = get_connection
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request = json.loads(self.encode_rpc_request(method, params))
+        return await self._get_connection().request(request, self.request_timeout)
+
+    async def make_batch_request(self, requests: list[tuple[RPCEndpoint, Any]]) -> list[RPCResponse]:
+        return list(await asyncio.gather(*(self.make_request(method, params) for method, params in requests)))
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            response = await self.make_request(RPCEndpoint("web3_clientVersion"), [])
+        except Exception:
+            if show_traceback:
+                raise
+            return False
+        return "error" not in response
+
+    @property
+    def head_number(self) -> int | None:
+        return self._get_connection().head_number
+
+    async def next_head(self, after: int | None = None, timeout: float = 30) -> dict | None:
+        return await self._get_connection().next_head(after, timeout)
+
+    async def disconnect(self) -> None:
+        pass
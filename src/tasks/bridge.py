@@ -16,8 +16,8 @@ from configs import (
 
 
 class BaseBridgeModule(AsyncLogger, Wallet, ABC):
-    def __init__(self, account: Account, rpc_url: str) -> None:
-        Wallet.__init__(self, account.keypair, rpc_url, account.proxy)
+    def __init__(self, account: Account, rpc_url: str | list[str]) -> None:
+        Wallet.__init__(self, account.signer, rpc_url, account.proxy, chain_name=self.source_chain)
         AsyncLogger.__init__(self)
         
     async def __aenter__(self) -> Self:
@@ -49,10 +49,11 @@ class BaseBridgeModule(AsyncLogger, Wallet, ABC):
             type_msg="info", address=self.wallet_address
         )
         
-        if not await self.check_balance():
+        balances = await self.token_balances([self.ZERO_ADDRESS, token_address])
+        if not balances[self.ZERO_ADDRESS]:
             return False, "Insufficient native balance"
         
-        balance = await self.token_balance(token_address)
+        balance = balances[token_address] or 0
         if balance <= 0:
             return False, f"Not enough tokens {token_name} on the chain {source_chain}"
         
@@ -6,7 +6,7 @@ from typing import Self, Tuple
 from src.wallet import Wallet
 from src.logger import AsyncLogger
 from src.models import Account, TestnetBridgeContract
-from src.utils import show_trx_log, random_sleep
+from src.utils import show_trx_log, random_sleep, resource_limits
 from bot_loader import config
 from configs import (
     MAX_RETRY_ATTEMPTS,
@@ -16,7 +16,7 @@ from configs import (
 
 class BuySepoliaModule(AsyncLogger, Wallet):
     def __init__(self, account: Account) -> None:
-        Wallet.__init__(self, account.keypair, config.arbitrum_rpc, account.proxy)
+        Wallet.__init__(self, account.signer, config.arbitrum_rpc, account.proxy, chain_name='Arbitrum')
         AsyncLogger.__init__(self)
         
     async def __aenter__(self) -> Self:
@@ -27,9 +27,10 @@ class BuySepoliaModule(AsyncLogger, Wallet):
         await Wallet.__aexit__(self, exc_type, exc_val, exc_tb)
         
     async def make_rpc_call(self, payload):
-        async with aiohttp.ClientSession() as session:
-            async with session.post("https://ethereum.publicnode.com/", json=payload) as response:
-                return await response.json()
+        async with resource_limits.limit_url("https://ethereum.publicnode.com/"):
+            async with aiohttp.ClientSession() as session:
+                async with session.post("https://ethereum.publicnode.com/", json=payload) as response:
+                    return await response.json()
         
     async def get_swap_quote(self, amount_in_wei: int) -> int:
         weth_address = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
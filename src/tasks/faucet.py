@@ -11,7 +11,8 @@ from src.exceptions.discord_exceptions import (
 from src.wallet import Wallet
 from src.logger import AsyncLogger
 from src.models import Account, CHAINS
-from src.utils import random_sleep, clean_bad_auth_tokens_discord
+from src.utils import random_sleep, clean_bad_auth_tokens_discord, resource_limits
+from bot_loader import config
 from configs import (
     FAUCET_CHAINS,
     FAUCET_SLEEP_RANGE_BETWEEN_CHAINS,
@@ -85,7 +86,7 @@ class FaucetModule(Wallet):
         if not account.auth_tokens_discord:
             raise DiscordClientError("Discord token not provided")
             
-        Wallet.__init__(self, account.keypair, account.proxy)
+        Wallet.__init__(self, account.signer, config.expchain_rpc, account.proxy, chain_name='EXPchain')
         self.account = account
         self.session: AsyncSession | None = None
         
@@ -112,13 +113,14 @@ class FaucetModule(Wallet):
 
     async def get_bearer_token(self) -> str:
         try:
-            resp = await self.session.post(
-                url="https://discord.com/api/v9/oauth2/authorize",
-                params=self._OAUTH_PARAMS,
-                json=self._DISCORD_JSON_DATA,
-                headers=self.discord_headers,
-                allow_redirects=False
-            )
+            async with resource_limits.limit_url("https://discord.com/api/v9/oauth2/authorize"):
+                resp = await self.session.post(
+                    url="https://discord.com/api/v9/oauth2/authorize",
+                    params=self._OAUTH_PARAMS,
+                    json=self._DISCORD_JSON_DATA,
+                    headers=self.discord_headers,
+                    allow_redirects=False
+                )
             
             if resp.status_code in (401, 403):
                 await clean_bad_auth_tokens_discord(self.account.auth_tokens_discord)
@@ -127,12 +129,13 @@ class FaucetModule(Wallet):
             data = resp.json()
             auth_code = parse_qs(urlparse(data['location']).query)['code'][0]
             
-            resp = await self.session.get(
-                url="https://faucet-api.expchain.ai/api/v1/discord/callback",
-                params={'code': auth_code},
-                headers={'Referer': 'https://discord.com/'},
-                allow_redirects=False
-            )
+            async with resource_limits.limit_url("https://faucet-api.expchain.ai/api/v1/discord/callback"):
+                resp = await self.session.get(
+                    url="https://faucet-api.expchain.ai/api/v1/discord/callback",
+                    params={'code': auth_code},
+                    headers={'Referer': 'https://discord.com/'},
+                    allow_redirects=False
+                )
             
             if resp.status_code != 302:
                 raise DiscordAuthError("Faucet auth failed")
@@ -162,11 +165,12 @@ class FaucetModule(Wallet):
                 'to': self.wallet_address,
             }
             
-            response = await self.session.post(
-                url="https://faucet-api.expchain.ai/api/faucet",
-                json=json_data,
-                headers=self.faucet_headers,
-            )
+            async with resource_limits.limit_url("https://faucet-api.expchain.ai/api/faucet"):
+                response = await self.session.post(
+                    url="https://faucet-api.expchain.ai/api/faucet",
+                    json=json_data,
+                    headers=self.faucet_headers,
+                )
             
             response_data = response.json()
             
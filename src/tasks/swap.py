@@ -17,7 +17,7 @@ from configs import (
 
 class SwapModule(AsyncLogger, Wallet):
     def __init__(self, account: Account) -> None:
-        Wallet.__init__(self, account.keypair, config.expchain_rpc, account.proxy)
+        Wallet.__init__(self, account.signer, config.expchain_rpc, account.proxy, chain_name='EXPchain')
         AsyncLogger.__init__(self)
         self.tokens_dict = {}
         
@@ -33,17 +33,12 @@ class SwapModule(AsyncLogger, Wallet):
             msg=f"Filtering tokens",
             type_msg="info", address=self.wallet_address
         )
-        tokens_dict = {}
-        for token_name, token_address in SWAP_TOKENS.items():
-            if token_name == "tZKJ":
-                balance = await self.eth.get_balance(self.wallet_address)
-                if balance > 0:
-                    tokens_dict[token_name] = balance
-            else:
-                balance = await self.token_balance(token_address)
-                if balance > 0:
-                    tokens_dict[token_name] = balance
-        return tokens_dict
+        balances = await self.token_balances(list(SWAP_TOKENS.values()))
+        return {
+            token_name: balances[token_address]
+            for token_name, token_address in SWAP_TOKENS.items()
+            if balances[token_address]
+        }
     
     async def calculate_amount(
         self,
@@ -850,7 +845,6 @@ class SwapModule(AsyncLogger, Wallet):
                     min_dy
                 ),
                 gas=250_000,
-                gas_price=40000000000,
                 value=amount_to_swap if source_token == "tZKJ" else 0                
             )
             
@@ -3,3 +3,7 @@ from .bot_utils import *
 from .utils import *
 from .logger_trx import *
 from .clean_bad_discord_token import *
+from .concurrency import *
+from .timer import *
+from .resource_limiter import *
+from .adaptive_concurrency import *
@@ -0,0 +1,153 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Literal
+
+import aiohttp
+
+from configs import (
+    ADAPTIVE_CONCURRENCY, ADAPTIVE_ERROR_RATE,
+    ADAPTIVE_MIN_THREADS, ADAPTIVE_P95_LATENCY
+)
+
+
+Outcome = Literal["ok", "error", "timeout", "overload"]
+
+# JSON-RPC codes public nodes use for "request timed out" / "limit exceeded"
+OVERLOAD_RPC_CODES = {-32002, -32005, 429}
+OVERLOAD_HTTP_STATUSES = {429, 503}
+
+
+def classify_error(error: BaseException) -> Outcome:
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ServerTimeoutError)):
+        return "timeout"
+    if isinstance(error, aiohttp.ClientResponseError) and error.status in OVERLOAD_HTTP_STATUSES:
+        return "overload"
+    return "error"
+
+
+def classify_rpc_response(response: Any) -> Outcome:
+    if not isinstance(response, dict) or not isinstance(response.get("error"), dict):
+        return "ok"
+    return "overload" if response["error"].get("code") in OVERLOAD_RPC_CODES else "error"
+
+
+def classify_http_status(status: int) -> Outcome:
+    if status in OVERLOAD_HTTP_STATUSES:
+        return "overload"
+    return "error" if status >= 500 else "ok"
+
+
+class AdaptiveConcurrency:
+    """
+    Resizable replacement for the global `threads` semaphore.
+
+    Request outcomes reported by `Wallet` and `BaseAPIClient` are evaluated
+    every `INTERVAL` seconds: timeouts, overload errors or a slow p95 cut
+    the limit multiplicatively, a clean interval in which accounts had to
+    queue for a slot raises it by one (AIMD).
+    """
+    INTERVAL = 5.0
+    MIN_SAMPLES = 10
+    DECREASE_FACTOR = 0.75
+    MAX_SAMPLES = 2000
+
+    def __init__(
+        self,
+        limit: int = 1,
+        minimum: int = ADAPTIVE_MIN_THREADS,
+        enabled: bool = ADAPTIVE_CONCURRENCY
+    ) -> None:
+        self.enabled = enabled
+        self.min_threads = minimum
+        self.minimum = max(1, min(minimum, limit))
+        self.maximum = limit
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._latencies: deque[float] = deque(maxlen=self.MAX_SAMPLES)
+        self._failures = 0
+        self._samples = 0
+        self._saturated = False
+        self._window_started = time.monotonic()
+
+    def configure(self, threads: int) -> None:
+        """Start from `threads`, which is also the ceiling: the live limit only drops below it under load."""
+        self.minimum = max(1, min(self.min_threads, threads))
+        self.maximum = threads
+        self.limit = threads
+        self.in_use = 0
+        self._waiters.clear()
+        self._reset_window()
+
+    async def acquire(self) -> None:
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            return
+
+        self._saturated = True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right as we got cancelled
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_use += 1
+                waiter.set_result(None)
+
+    def record(self, latency: float, outcome: Outcome = "ok") -> None:
+        if not self.enabled:
+            return
+
+        self._samples += 1
+        if outcome in ("timeout", "overload"):
+            self._failures += 1
+        else:
+            self._latencies.append(latency)
+
+        if time.monotonic() - self._window_started >= self.INTERVAL:
+            self._adjust()
+
+    def _p95(self) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)]
+
+    def _adjust(self) -> None:
+        if self._samples < self.MIN_SAMPLES:
+            return
+
+        error_rate = self._failures / self._samples
+        if error_rate > ADAPTIVE_ERROR_RATE or self._p95() > ADAPTIVE_P95_LATENCY:
+            self.limit = max(self.minimum, int(self.limit * self.DECREASE_FACTOR))
+        elif self._saturated and self.limit < self.maximum:
+            self.limit += 1
+            self._wake_waiters()
+
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._latencies.clear()
+        self._failures = 0
+        self._samples = 0
+        self._saturated = bool(self._waiters)
+        self._window_started = time.monotonic()
+
+
+adaptive_concurrency = AdaptiveConcurrency()
@@ -0,0 +1,124 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Self
+
+from configs import RELEASE_SLOT_ON_SLEEP
+from .adaptive_concurrency import AdaptiveConcurrency
+
+
+_current_slot: ContextVar["ConcurrencySlot | None"] = ContextVar("current_slot", default=None)
+
+
+class ConcurrencySlot:
+    """
+    One unit of the global `threads` budget held by an account.
+
+    The slot is bound to the running task, so code deep inside the modules
+    can temporarily hand it back (see `release_slot`) without knowing which
+    limiter it came from. An account running several tasks at once (see
+    `gather_in_slot`) gives it back only while all of them sleep.
+    """
+    __slots__ = ('_limiter', '_held', '_token', '_tasks', '_sleeping', '_lock')
+
+    def __init__(self, limiter: asyncio.Semaphore | AdaptiveConcurrency) -> None:
+        self._limiter = limiter
+        self._held = False
+        self._token = None
+        self._tasks = 1
+        self._sleeping = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def held(self) -> bool:
+        return self._held
+
+    async def acquire(self) -> None:
+        if self._held:
+            return
+        # Tasks of one account waking together must not queue for a second unit of the limiter
+        async with self._lock:
+            if self._held:
+                return
+            await self._limiter.acquire()
+            self._held = True
+
+    def release(self) -> None:
+        if not self._held:
+            return
+        self._held = False
+        self._limiter.release()
+
+    def _release_if_idle(self) -> None:
+        if self._tasks and self._sleeping >= self._tasks:
+            self.release()
+
+    async def __aenter__(self) -> Self:
+        await self.acquire()
+        self._token = _current_slot.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        _current_slot.reset(self._token)
+        self._token = None
+        self.release()
+
+
+def current_slot() -> ConcurrencySlot | None:
+    return _current_slot.get()
+
+
+@asynccontextmanager
+async def release_slot() -> AsyncIterator[None]:
+    """
+    Give the current account's slot back for the duration of the block and
+    queue for it again afterwards.
+    """
+    slot = _current_slot.get()
+    if not RELEASE_SLOT_ON_SLEEP or slot is None:
+        yield
+        return
+
+    slot._sleeping += 1
+    slot._release_if_idle()
+    cancelled = False
+    try:
+        yield
+    except asyncio.CancelledError:
+        cancelled = True
+        raise
+    finally:
+        slot._sleeping -= 1
+        # A cancelled account must not wait for a free slot before it can stop
+        if not cancelled:
+            await slot.acquire()
+
+
+async def gather_in_slot(*aws: Awaitable[Any]) -> list[Any]:
+    """
+    `asyncio.gather` for tasks of the current account sharing its slot: a
+    sleeping task gives the slot back only once every other one sleeps too.
+    """
+    slot = _current_slot.get()
+    if slot is None or not aws:
+        return await asyncio.gather(*aws)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        try:
+            return await aw
+        finally:
+            slot._tasks -= 1
+            slot._release_if_idle()
+
+    # The caller only waits for the tasks: its share of the slot passes to them
+    slot._tasks += len(aws) - 1
+    cancelled = False
+    try:
+        return await asyncio.gather(*(run(aw) for aw in aws))
+    except asyncio.CancelledError:
+        cancelled = True
+        raise
+    finally:
+        slot._tasks += 1
+        if not cancelled:
+            await slot.acquire()
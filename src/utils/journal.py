@@ -0,0 +1,178 @@
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from configs import RUN_RESUME_MAX_AGE, USE_RUN_JOURNAL
+
+
+JOURNAL_PATH = Path(__file__).parent.parent.parent / "config" / "data" / "run_journal.db"
+
+_TX_HASH_PATTERN = re.compile(r'(?:0x)?[0-9a-fA-F]{64}')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    module TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS accounts (
+    run_id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    tx_hash TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, address)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    run_id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    task TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    tx_hash TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, address, task)
+);
+"""
+
+
+def extract_tx_hash(message: Any) -> str | None:
+    match = _TX_HASH_PATTERN.search(str(message))
+    if not match:
+        return None
+    tx_hash = match.group(0)
+    return tx_hash if tx_hash.startswith("0x") else f"0x{tx_hash}"
+
+
+class RunJournal:
+    """
+    On-disk record of per-account and per-task outcomes of a run.
+
+    A run stays open until every account has been dispatched. Starting the
+    same module while an open run exists resumes it, so accounts and route
+    tasks that already succeeded are not executed a second time; failed
+    ones are retried. A run without results for `resume_max_age` hours is
+    left behind and a new one is started.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = JOURNAL_PATH,
+        enabled: bool = USE_RUN_JOURNAL,
+        resume_max_age: float = RUN_RESUME_MAX_AGE
+    ) -> None:
+        self.path = Path(path)
+        self.enabled = enabled
+        self.resume_max_age = resume_max_age
+        self.run_id: int | None = None
+        self._owner = False
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and self.run_id is not None
+
+    def start_run(self, module: str) -> bool:
+        """Open a run for the module and return True if an unfinished one was resumed."""
+        if not self.enabled:
+            return False
+        
+        if self.run_id is not None and not self._owner:
+            return True
+
+        connection = self._connect()
+        row = connection.execute(
+            """
+            SELECT id FROM runs
+            WHERE module = ? AND finished_at IS NULL AND COALESCE(
+                (SELECT MAX(updated_at) FROM accounts WHERE accounts.run_id = runs.id), started_at
+            ) >= ?
+            ORDER BY id DESC LIMIT 1
+            """,
+            (module, time.time() - self.resume_max_age * 3600)
+        ).fetchone()
+
+        self._owner = True
+        if row:
+            self.run_id = row[0]
+            return True
+
+        cursor = connection.execute(
+            "INSERT INTO runs (module, started_at) VALUES (?, ?)",
+            (module, time.time())
+        )
+        self.run_id = cursor.lastrowid
+        return False
+
+    def attach(self, run_id: int) -> None:
+        """Join a run opened by another process; only the process that opened it may finish it."""
+        self.run_id = run_id
+        self._owner = False
+
+    def finish_run(self) -> None:
+        if not self.active or not self._owner:
+            return
+        self._connect().execute(
+            "UPDATE runs SET finished_at = ? WHERE id = ?",
+            (time.time(), self.run_id)
+        )
+        self.run_id = None
+
+    def completed_accounts(self) -> dict[str, tuple[bool, str]]:
+        """Accounts that succeeded in this run; failed ones are left to be processed again on resume."""
+        if not self.active:
+            return {}
+        rows = self._connect().execute(
+            "SELECT address, success, message FROM accounts WHERE run_id = ? AND success = 1",
+            (self.run_id,)
+        ).fetchall()
+        return {address: (bool(success), message) for address, success, message in rows}
+
+    def completed_tasks(self, address: str) -> dict[str, dict[str, Any]]:
+        if not self.active:
+            return {}
+        rows = self._connect().execute(
+            "SELECT task, success, message FROM tasks WHERE run_id = ? AND address = ?",
+            (self.run_id, address)
+        ).fetchall()
+        return {
+            task: {"success": bool(success), "message": message}
+            for task, success, message in rows
+        }
+
+    def record_task(self, address: str, task: str, success: bool, message: Any) -> None:
+        if not self.active:
+            return
+        self._connect().execute(
+            "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.run_id, address, task, int(success), str(message), extract_tx_hash(message), time.time())
+        )
+
+    def record_account(self, address: str, success: bool, message: Any) -> None:
+        if not self.active:
+            return
+        self._connect().execute(
+            "INSERT OR REPLACE INTO accounts VALUES (?, ?, ?, ?, ?, ?)",
+            (self.run_id, address, int(success), str(message), extract_tx_hash(message), time.time())
+        )
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+run_journal = RunJournal()
@@ -0,0 +1,218 @@
+import base64
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from Crypto.Cipher import AES
+from eth_account.hdaccount import seed_from_mnemonic
+from eth_account.hdaccount.deterministic import (
+    BASE_NODE_IDENTIFIERS, SECP256K1_N, HardNode, Node, SoftNode,
+    derive_child_key, ec_point, hmac_sha512
+)
+from eth_utils import ValidationError, to_checksum_address
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+
+from configs import ACCOUNT_KEY_CACHE, DERIVATION_CHUNK_SIZE, DERIVATION_PROCESSES
+from src.models import Account
+
+
+KEY_CACHE_PATH = Path(__file__).parent.parent.parent / "config" / "data" / "account_keys.json"
+
+Derived = tuple[bytes, str]
+
+
+def _derive_chunk(keypairs: list[str]) -> list[Derived | None]:
+    # Runs in a pool process: invalid rows come back as None and fail later, when the account is used
+    results: list[Derived | None] = []
+    for keypair in keypairs:
+        try:
+            signer = Account.derive(keypair)
+        except ValueError:
+            results.append(None)
+            continue
+        results.append((bytes(signer.key), signer.address))
+    return results
+
+
+class KeyCache:
+    """
+    Private keys and addresses derived from the rows of accounts.xlsx, kept in
+    config/data/account_keys.json so unchanged rows skip PBKDF2 and key
+    derivation on the next start.
+
+    Entries are keyed by a hash of the row and encrypted with AES-GCM under a
+    key derived from the same row: the file reveals nothing to someone who
+    does not already have accounts.xlsx.
+    """
+
+    def __init__(self, path: str | Path = KEY_CACHE_PATH) -> None:
+        self.path = Path(path)
+
+    @staticmethod
+    def _entry_id(keypair: str) -> str:
+        return hashlib.sha256(b"account-id:" + keypair.strip().encode()).hexdigest()
+
+    @staticmethod
+    def _entry_key(keypair: str) -> bytes:
+        return hashlib.sha256(b"account-key:" + keypair.strip().encode()).digest()
+
+    def _load(self) -> dict[str, str]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, entries: dict[str, str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One temp file per write: every shard process loads the config and may save at the same time
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self.path.parent, prefix=self.path.name, suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_file.write(json.dumps(entries))
+        try:
+            os.replace(temp_file.name, self.path)
+        except OSError:
+            os.unlink(temp_file.name)
+            raise
+
+    def _encrypt(self, keypair: str, derived: Derived) -> str:
+        private_key, address = derived
+        cipher = AES.new(self._entry_key(keypair), AES.MODE_GCM)
+        ciphertext, tag = cipher.encrypt_and_digest(private_key + bytes.fromhex(address[2:]))
+        return base64.b64encode(cipher.nonce + tag + ciphertext).decode()
+
+    def _decrypt(self, keypair: str, entry: str) -> Derived | None:
+        try:
+            blob = base64.b64decode(entry)
+            cipher = AES.new(self._entry_key(keypair), AES.MODE_GCM, nonce=blob[:16])
+            plaintext = cipher.decrypt_and_verify(blob[32:], blob[16:32])
+        except (ValueError, KeyError):
+            return None
+        if len(plaintext) != 52:
+            return None
+        return plaintext[:32], to_checksum_address(plaintext[32:])
+
+    def materialize(self, accounts: list[Account]) -> None:
+        """Give every account its key and address, deriving only rows missing from the cache."""
+        entries = self._load() if ACCOUNT_KEY_CACHE else {}
+        kept: dict[str, str] = {}
+        missing: dict[str, list[Account]] = {}
+
+        for account in accounts:
+            entry_id = self._entry_id(account.keypair)
+            entry = entries.get(entry_id)
+            derived = self._decrypt(account.keypair, entry) if entry else None
+            if derived is None:
+                missing.setdefault(account.keypair, []).append(account)
+                continue
+            kept[entry_id] = entry
+            account.preload(*derived)
+
+        if missing:
+            for keypair, derived in zip(missing, derive_keypairs(list(missing))):
+                if derived is None:
+                    continue
+                kept[self._entry_id(keypair)] = self._encrypt(keypair, derived)
+                for account in missing[keypair]:
+                    account.preload(*derived)
+
+        # Rewritten only when rows changed, which also drops rows no longer in accounts.xlsx
+        if ACCOUNT_KEY_CACHE and kept != entries:
+            self._save(kept)
+
+
+def derive_keypairs(keypairs: list[str]) -> list[Derived | None]:
+    """Derive keys and addresses, fanned out in chunks over DERIVATION_PROCESSES processes."""
+    chunk_size = max(1, DERIVATION_CHUNK_SIZE)
+    chunks = [keypairs[start:start + chunk_size] for start in range(0, len(keypairs), chunk_size)]
+    if len(chunks) <= 1:
+        return _derive_chunk(keypairs)
+
+    results: list[list[Derived | None]] = [[] for _ in chunks]
+    progress = Progress(
+        TextColumn("Deriving accounts"), BarColumn(), MofNCompleteColumn(), TimeRemainingColumn(),
+        transient=True
+    )
+    try:
+        with progress, ProcessPoolExecutor(
+            max_workers=min(DERIVATION_PROCESSES or os.cpu_count() or 1, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            task = progress.add_task("derive", total=len(keypairs))
+            futures = {executor.submit(_derive_chunk, chunk): index for index, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                progress.advance(task, len(chunks[index]))
+    except (BrokenProcessPool, OSError):
+        # Processes could not be started (e.g. a frozen build): derive the rest here
+        for index, chunk in enumerate(chunks):
+            if not results[index]:
+                results[index] = _derive_chunk(chunk)
+
+    return [derived for chunk in results for derived in chunk]
+
+
+class HDSeed:
+    """
+    BIP-32 children of one mnemonic along a path template such as
+    m/44'/60'/0'/0/{index}. The seed (PBKDF2) and the levels before {index}
+    are derived once, so each child costs one HMAC-SHA512, plus one step per
+    level after {index}.
+    """
+
+    def __init__(self, mnemonic: str, path: str, passphrase: str = "") -> None:
+        levels = path.strip().split("/")
+        positions = [position for position, level in enumerate(levels) if "{index}" in level]
+        if (
+            levels[0] not in BASE_NODE_IDENTIFIERS
+            or len(positions) != 1
+            or levels[positions[0]].replace("{index}", "") not in ("", "'", "H")
+        ):
+            raise ValueError(f"Derivation path must start with m and have {{index}} as one level: {path}")
+
+        position = positions[0]
+        self.hardened = levels[position] != "{index}"
+        try:
+            prefix = [Node.decode(level) for level in levels[1:position]]
+            self._suffix = [Node.decode(level) for level in levels[position + 1:]]
+            seed = seed_from_mnemonic(" ".join(mnemonic.split()), passphrase)
+        except ValidationError as error:
+            raise ValueError(str(error)) from error
+
+        master = hmac_sha512(b"Bitcoin seed", seed)
+        self._key, self._chain_code = master[:32], master[32:]
+        for node in prefix:
+            self._key, self._chain_code = derive_child_key(self._key, self._chain_code, node)
+        self._public_key = ec_point(self._key)
+
+    def private_key(self, index: int) -> bytes:
+        try:
+            node = (HardNode if self.hardened else SoftNode)(index)
+        except ValidationError as error:
+            raise ValueError(str(error)) from error
+
+        if self.hardened:
+            key, chain_code = derive_child_key(self._key, self._chain_code, node)
+        else:
+            # derive_child_key would recompute the parent's public key (an EC multiplication) for every child
+            child = hmac_sha512(self._chain_code, self._public_key + node.serialize())
+            tweak = int.from_bytes(child[:32], "big")
+            child_key = (tweak + int.from_bytes(self._key, "big")) % SECP256K1_N
+            if tweak >= SECP256K1_N or child_key == 0:
+                key, chain_code = derive_child_key(self._key, self._chain_code, node)
+            else:
+                key, chain_code = child_key.to_bytes(32, "big"), child[32:]
+
+        for node in self._suffix:
+            key, chain_code = derive_child_key(key, chain_code, node)
+        return key
+
+
+key_cache = KeyCache()
@@ -9,7 +9,8 @@ from ruamel.yaml import YAML
 
 from configs import SHUFFLE_WALLETS
 from src.exceptions.custom_exceptions import ConfigurationError
-from src.models import Account, Config
+from src.models import Account, Config, HDAccounts
+from src.utils.key_derivation import HDSeed, key_cache
 
 
 yaml = YAML(typ='safe')
@@ -88,6 +89,7 @@ class ConfigLoader:
             if col not in col_map:
                 raise ConfigurationError(f'Missing required column: {col}')
         
+        index = 0
         for row in rows:
             if all(cell is None or str(cell).strip() == '' for cell in row):
                 continue
@@ -112,6 +114,7 @@ class ConfigLoader:
             if proxy_str:
                 proxy = Proxy.from_str(str(proxy_str).strip())
             
+            index += 1
             yield Account(
                 keypair=keypair,
                 proxy=proxy,
@@ -119,13 +122,50 @@ class ConfigLoader:
                     str(auth_tokens_discord).strip() 
                     if auth_tokens_discord 
                     else None
-                )
+                ),
+                index=index
             )
 
+    def _get_hd_accounts(self, settings: HDAccounts, start_index: int) -> Generator[Account, None, None]:
+        try:
+            seed = HDSeed(settings.mnemonic, settings.path, settings.passphrase)
+        except ValueError as error:
+            raise ConfigurationError(f'Invalid hd_accounts: {error}') from error
+        
+        index = start_index
+        for start, end in parse_account_range(settings.indexes):
+            if end is None:
+                raise ConfigurationError(f'hd_accounts indexes need an end: {settings.indexes}')
+            
+            for child in range(start, end + 1):
+                try:
+                    private_key = seed.private_key(child)
+                except ValueError as error:
+                    raise ConfigurationError(f'Invalid hd_accounts index {child}: {error}') from error
+                
+                index += 1
+                yield Account(keypair='0x' + private_key.hex(), index=index)
+
     def load(self) -> Config:
         try:
             params = self._load_yaml()
-            accounts = list(self._get_accounts())
+            hd_accounts = (
+                HDAccounts.model_validate(params['hd_accounts'])
+                if params.get('hd_accounts')
+                else None
+            )
+            
+            # With hd_accounts configured, accounts.xlsx is optional
+            accounts = (
+                list(self._get_accounts())
+                if hd_accounts is None or self.file_paths['accounts'].path.exists()
+                else []
+            )
+            key_cache.materialize(accounts)
+            
+            # Children of the master seed skip the key cache: their keys cost an HMAC, addresses are derived on first use
+            if hd_accounts is not None:
+                accounts.extend(self._get_hd_accounts(hd_accounts, len(accounts)))
             
             if not accounts:
                 raise ConfigurationError('No valid accounts found')
@@ -148,4 +188,53 @@ class ConfigLoader:
 
 
 def load_config() -> Config:
-    return ConfigLoader().load()
\ No newline at end of file
+    return ConfigLoader().load()
+
+
+def parse_account_range(spec: str) -> list[tuple[int, int | None]]:
+    """Parse account numbers like '1-100,250,300-' into (start, end) pairs, end=None is open-ended."""
+    ranges: list[tuple[int, int | None]] = []
+    
+    for part in (p.strip() for p in spec.split(',')):
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, _, end = part.partition('-')
+                ranges.append((
+                    int(start) if start.strip() else 1,
+                    int(end) if end.strip() else None
+                ))
+            else:
+                ranges.append((int(part), int(part)))
+        except ValueError as error:
+            raise ConfigurationError(f'Invalid account range: {part}') from error
+    
+    return ranges
+
+
+def select_accounts(
+    accounts: list[Account], 
+    account_range: str | None = None, 
+    addresses: list[str] | None = None
+) -> list[Account]:
+    selected = accounts
+    
+    if account_range:
+        ranges = parse_account_range(account_range)
+        selected = [
+            account for account in selected
+            if any(
+                start <= account.index and (end is None or account.index <= end)
+                for start, end in ranges
+            )
+        ]
+    
+    if addresses:
+        wanted = {address.lower() for address in addresses}
+        selected = [
+            account for account in selected
+            if account.address.lower() in wanted
+        ]
+    
+    return selected
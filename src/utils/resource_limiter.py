@@ -0,0 +1,106 @@
+import asyncio
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import AsyncIterator, Mapping
+from urllib.parse import urlparse
+
+from src.models import ResourceLimit
+
+
+class ResourceLimiter:
+    """
+    Concurrency and requests-per-second cap for a single resource.
+
+    Requests are spaced evenly at `1 / rps` seconds; a zero value disables
+    the corresponding limit.
+    """
+    __slots__ = ('name', '_semaphore', '_interval', '_next_at')
+
+    def __init__(self, name: str, concurrency: int = 0, rps: float = 0) -> None:
+        self.name = name
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+        self._interval = 1 / rps if rps > 0 else 0.0
+        self._next_at = 0.0
+
+    async def acquire(self) -> None:
+        if self._semaphore:
+            await self._semaphore.acquire()
+
+        if not self._interval:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start_at = max(now, self._next_at)
+        self._next_at = start_at + self._interval
+
+        if start_at > now:
+            try:
+                await asyncio.sleep(start_at - now)
+            except asyncio.CancelledError:
+                self.release()
+                raise
+
+    def release(self) -> None:
+        if self._semaphore:
+            self._semaphore.release()
+
+
+class ResourceLimits:
+    """
+    Registry of limiters keyed by chain name, RPC host or HTTP host.
+
+    Keys without an explicit entry get their own limiter built from the
+    `default` entry, if one is configured.
+    """
+    DEFAULT_KEY = "default"
+
+    def __init__(self, limits: Mapping[str, ResourceLimit] | None = None) -> None:
+        self._limits: dict[str, ResourceLimit] = {}
+        self._limiters: dict[str, ResourceLimiter | None] = {}
+        self.configure(limits or {})
+
+    def configure(self, limits: Mapping[str, ResourceLimit]) -> None:
+        self._limits = {key.lower(): value for key, value in limits.items()}
+        self._limiters.clear()
+
+    @staticmethod
+    def host_of(url: str | None) -> str | None:
+        if not url:
+            return None
+        return urlparse(str(url)).hostname or None
+
+    def get(self, key: str) -> ResourceLimiter | None:
+        key = key.lower()
+        if key in self._limiters:
+            return self._limiters[key]
+
+        limit = self._limits.get(key) or self._limits.get(self.DEFAULT_KEY)
+        limiter = None
+        if limit and (limit.concurrency or limit.rps):
+            limiter = ResourceLimiter(key, limit.concurrency, limit.rps)
+
+        self._limiters[key] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def limit(self, *keys: str | None) -> AsyncIterator[None]:
+        # Acquire in a fixed order so two callers sharing keys never deadlock
+        limiters = [
+            limiter for key in sorted({key.lower() for key in keys if key})
+            if (limiter := self.get(key))
+        ]
+        acquired: list[ResourceLimiter] = []
+        try:
+            for limiter in limiters:
+                await limiter.acquire()
+                acquired.append(limiter)
+            yield
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+
+    def limit_url(self, url: str, *keys: str | None) -> AbstractAsyncContextManager[None]:
+        return self.limit(self.host_of(url), *keys)
+
+
+resource_limits = ResourceLimits()
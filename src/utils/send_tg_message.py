@@ -8,10 +8,11 @@ from src.models import Account
 
 class SendTgMessage(Wallet, AsyncLogger):
     def __init__(self, account: Account):
-        Wallet.__init__(self, account.keypair, account.proxy)
+        from bot_loader import config
+        
+        Wallet.__init__(self, account.signer, config.expchain_rpc, account.proxy)
         AsyncLogger.__init__(self)
         
-        from bot_loader import config
         self.bot = telebot.TeleBot(config.tg_token)
         self.chat_id = config.tg_id
 
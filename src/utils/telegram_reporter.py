@@ -3,7 +3,6 @@ from dataclasses import dataclass, field
 from collections import defaultdict
 
 from src.models import Account
-from src.utils import get_address
 from src.utils.send_tg_message import SendTgMessage
 from src.logger import AsyncLogger
 
@@ -26,7 +25,7 @@ class TelegramReporter:
     
     def add_result(self, account: Account, success: bool, message: str, 
                   module: str = None, module_results: dict[str, Any] = None) -> None:
-        address = get_address(account.keypair)
+        address = account.address
 
         if address in self.account_results:
             result = self.account_results[address]
@@ -0,0 +1,91 @@
+import asyncio
+import heapq
+import itertools
+
+
+class TimerService:
+    """
+    Process-wide sleep service backed by a single heap of deadlines.
+
+    Only the earliest deadline is registered with the event loop, so every
+    sleeper is woken exactly once no matter how many accounts are waiting.
+    """
+    __slots__ = ('_heap', '_counter', '_handle', '_handle_deadline', '_loop', '_pending')
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._handle: asyncio.TimerHandle | None = None
+        self._handle_deadline: float | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is loop:
+            return
+        if self._handle:
+            self._handle.cancel()
+        self._heap.clear()
+        self._handle = None
+        self._handle_deadline = None
+        self._loop = loop
+        self._pending = 0
+
+    def _schedule(self) -> None:
+        while self._heap and self._heap[0][2].done():
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            if self._handle:
+                self._handle.cancel()
+            self._handle = None
+            self._handle_deadline = None
+            return
+
+        deadline = self._heap[0][0]
+        if self._handle and self._handle_deadline <= deadline:
+            return
+
+        if self._handle:
+            self._handle.cancel()
+        self._handle = self._loop.call_at(deadline, self._fire)
+        self._handle_deadline = deadline
+
+    def _fire(self) -> None:
+        self._handle = None
+        self._handle_deadline = None
+        now = self._loop.time()
+
+        while self._heap and self._heap[0][0] <= now:
+            _, _, future = heapq.heappop(self._heap)
+            if not future.done():
+                future.set_result(None)
+
+        self._schedule()
+
+    async def sleep(self, delay: float) -> None:
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+
+        future = loop.create_future()
+        heapq.heappush(self._heap, (loop.time() + delay, next(self._counter), future))
+        self._pending += 1
+        self._schedule()
+
+        try:
+            await future
+        finally:
+            self._pending -= 1
+            if not future.done():
+                future.cancel()
+
+
+timer_service = TimerService()
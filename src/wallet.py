@@ -1,22 +1,31 @@
 import asyncio
 import random
+import time
 from decimal import Decimal
 from typing import Any, Union, Self
 
 from better_proxy import Proxy
 from eth_account import Account
 from eth_account.messages import encode_defunct
+from eth_account.signers.local import LocalAccount
 from eth_typing import ChecksumAddress, HexStr
 from pydantic import HttpUrl
-from web3 import AsyncHTTPProvider, AsyncWeb3
+from web3 import AsyncWeb3
 from web3.contract import AsyncContract
 from web3.eth import AsyncEth
 from web3.types import Nonce, TxParams
-from web3.middleware import ExtraDataToPOAMiddleware
+from web3.middleware import ExtraDataToPOAMiddleware, Web3Middleware
 
-from src.exceptions.custom_exceptions import InsufficientFundsError, WalletError
+from src.exceptions.custom_exceptions import ChainMismatchError, InsufficientFundsError, WalletError
+from src.models.chains import CHAINS
+from src.models.config_model import Account as ConfigAccount
 from src.models.onchain_model import BaseContract, ERC20Contract
 from src.logger import AsyncLogger
+from src.rpc import FailoverProvider, Multicall, endpoints_of, fee_oracle, nonce_manager, provider_pool, receipt_watcher, token_registry
+from src.utils.adaptive_concurrency import (
+    adaptive_concurrency, classify_error, classify_rpc_response
+)
+from src.utils.resource_limiter import resource_limits
 
 
 logger = AsyncLogger()
@@ -27,6 +36,64 @@ class BlockchainError(Exception):
     """
     Base class for blockchain-related errors.
     """
+
+
+class ResourceLimitMiddleware(Web3Middleware):
+    """
+    Holds the chain and RPC host limiters from `settings.yaml` for the
+    duration of every request made through the wallet.
+    """
+    
+    async def async_wrap_make_request(self, make_request):
+        async def middleware(method, params):
+            async with resource_limits.limit(*self._w3.resource_keys):
+                return await make_request(method, params)
+        return middleware
+
+    async def async_wrap_make_batch_request(self, make_batch_request):
+        async def middleware(requests_info):
+            async with resource_limits.limit(*self._w3.resource_keys):
+                return await make_batch_request(requests_info)
+        return middleware
+
+
+class RequestMetricsMiddleware(Web3Middleware):
+    """
+    Reports latency, timeouts and overload errors of every RPC call to the
+    adaptive `threads` controller.
+    """
+    
+    async def async_wrap_make_request(self, make_request):
+        async def middleware(method, params):
+            started = time.monotonic()
+            try:
+                response = await make_request(method, params)
+            except Exception as error:
+                adaptive_concurrency.record(time.monotonic() - started, classify_error(error))
+                raise
+            adaptive_concurrency.record(time.monotonic() - started, classify_rpc_response(response))
+            return response
+        return middleware
+
+
+class PooledEth(AsyncEth):
+    """
+    `eth` module whose chain id comes from the provider pool: asked once per
+    endpoint and checked against `CHAINS` instead of on every transaction.
+    A failover provider checks each endpoint itself before it serves requests.
+    """
+
+    @property
+    async def chain_id(self) -> int:
+        chain = CHAINS.get(getattr(self.w3, "chain_name", None))
+        provider = self.w3.provider
+        if isinstance(provider, FailoverProvider) and provider.expected_chain_id is not None:
+            # Each endpoint is checked against it before it serves a request (FailoverProvider._attempt)
+            return provider.expected_chain_id
+        return await provider_pool.chain_id(
+            self.w3.provider.endpoint_uri, self._chain_id, chain.id if chain else None
+        )
+
     
 class Wallet(AsyncWeb3, Account):
     ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
@@ -35,26 +102,31 @@ class Wallet(AsyncWeb3, Account):
     
     def __init__(
         self, 
-        keypair: str, 
-        rpc_url: Union[HttpUrl, str], 
+        keypair: Union[str, LocalAccount], 
+        rpc_url: Union[HttpUrl, str, list[str]], 
         proxy: Proxy | None = None,
-        request_timeout: int = 30
+        request_timeout: int = 30,
+        chain_name: str | None = None
     ) -> None:
-        self._provider = AsyncHTTPProvider(
-            str(rpc_url),
-            request_kwargs={
-                "proxy": proxy.as_url if proxy else None,
-                "ssl": False,
-                "timeout": request_timeout
-            }
-        )
+        rpc_urls = endpoints_of(rpc_url)
+        self.chain_name = chain_name
+        # With several endpoints the failover provider applies the host limit of the one it picks
+        self.resource_keys = (chain_name, resource_limits.host_of(rpc_urls[0]) if len(rpc_urls) == 1 else None)
+        self._provider = provider_pool.get_provider(rpc_urls, proxy, request_timeout)
+        chain = CHAINS.get(chain_name)
+        if isinstance(self._provider, FailoverProvider) and chain:
+            self._provider.expected_chain_id = chain.id
             
-        super().__init__(self._provider, modules={"eth": AsyncEth})
+        super().__init__(self._provider, modules={"eth": PooledEth})
         
         self.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+        # Metrics sit inside the limiter: time spent queueing for our own rps/concurrency limits is not RPC latency
+        self.middleware_onion.add(RequestMetricsMiddleware, name="request_metrics")
+        self.middleware_onion.add(ResourceLimitMiddleware, name="resource_limits")
         
         self.keypair = self._initialize_account(keypair)
         self._contracts_cache: dict[str, AsyncContract] = {}
+        self._multicall: Multicall | None = None
         self._is_closed = False
         
     async def __aenter__(self) -> Self:
@@ -68,16 +140,7 @@ class Wallet(AsyncWeb3, Account):
             return
         
         try:
-            if self._provider:
-                if isinstance(self._provider, AsyncHTTPProvider):
-                    await self._provider.disconnect()
-                    await logger.logger_msg(
-                        msg="Provider disconnected successfully", 
-                        type_msg="debug", 
-                        class_name=self.__class__.__name__, 
-                        method_name="close"
-                    )
-                    
+            # Connections belong to the shared provider pool and stay open for other wallets
             self._contracts_cache.clear()
             
         except Exception as e:
@@ -91,31 +154,13 @@ class Wallet(AsyncWeb3, Account):
             self._is_closed = True
 
     @staticmethod
-    def _initialize_account(input_str: str) -> Account:
-        input_str = input_str.strip()
-
-        key_candidate = input_str.replace(" ", "")
-        if key_candidate.startswith('0x'):
-            key_body = key_candidate[2:]
-        else:
-            key_body = key_candidate
-
-        if len(key_body) == 64 and all(c in '0123456789abcdefABCDEF' for c in key_body):
-            keypair = '0x' + key_body if not key_candidate.startswith('0x') else key_candidate
-            try:
-                return Account.from_key(keypair)
-            except ValueError:
-                pass
-
-        words = [word for word in input_str.split() if word]
-        if len(words) in (12, 24):
-            mnemonic = ' '.join(words)
-            try:
-                return Account.from_mnemonic(mnemonic)
-            except ValueError as e:
-                raise WalletError(f"Invalid mnemonic phrase: {e}")
-        else:
-            raise WalletError("Input must be a 12 or 24 word mnemonic phrase or a 64-character hexadecimal private key")
+    def _initialize_account(keypair: Union[str, LocalAccount]) -> LocalAccount:
+        if isinstance(keypair, LocalAccount):
+            return keypair
+        try:
+            return ConfigAccount.derive(keypair)
+        except ValueError as e:
+            raise WalletError(str(e))
 
     @property
     def wallet_address(self):
@@ -124,8 +169,7 @@ class Wallet(AsyncWeb3, Account):
     @property
     async def use_eip1559(self) -> bool:
         try:
-            latest_block = await self.eth.get_block('latest')
-            return 'baseFeePerGas' in latest_block
+            return await fee_oracle.for_chain(self._chain_key).supports_eip1559(self)
         except Exception as e:
             await logger.logger_msg(
                 msg=f"Error checking EIP-1559 support: {e}", type_msg="error", 
@@ -174,6 +218,18 @@ class Wallet(AsyncWeb3, Account):
             self._get_checksum_address(self.keypair.address)
         ).call()
 
+    @property
+    def multicall(self) -> Multicall:
+        if self._multicall is None:
+            self._multicall = Multicall(self)
+        return self._multicall
+
+    async def token_balances(self, token_addresses: list[str]) -> dict[str, int | None]:
+        """Balances of several tokens (zero address = native) in one multicall."""
+        owner = self._get_checksum_address(self.keypair.address)
+        balances = await self.multicall.balances([owner], token_addresses)
+        return {token: balances[(owner, token)] for token in token_addresses}
+
     def _is_native_token(self, token_address: str) -> bool:
         return token_address == self.ZERO_ADDRESS
 
@@ -183,14 +239,20 @@ class Wallet(AsyncWeb3, Account):
             self._contracts_cache[checksum_address] = await self.get_contract(checksum_address)
         return self._contracts_cache[checksum_address]
 
+    async def _get_token_decimals(self, checksum_address: str) -> int:
+        async def fetch() -> int:
+            contract = await self._get_cached_contract(checksum_address)
+            return await contract.functions.decimals().call()
+
+        return await token_registry.decimals(await self.eth.chain_id, checksum_address, fetch)
+
     async def convert_amount_to_decimals(self, amount: Decimal, token_address: str) -> int:
         checksum_address = self._get_checksum_address(token_address)
     
         if self._is_native_token(checksum_address):
             return self.to_wei(Decimal(str(amount)), 'ether')
         
-        contract = await self._get_cached_contract(checksum_address)
-        decimals = await contract.functions.decimals().call()
+        decimals = await self._get_token_decimals(checksum_address)
         return int(Decimal(str(amount)) * Decimal(10 ** decimals))
     
     async def convert_amount_from_decimals(self, amount: int, token_address: str) -> float:
@@ -199,8 +261,7 @@ class Wallet(AsyncWeb3, Account):
         if self._is_native_token(checksum_address):
             return float(self.from_wei(amount, 'ether'))
         
-        contract = await self._get_cached_contract(checksum_address)
-        decimals = await contract.functions.decimals().call()
+        decimals = await self._get_token_decimals(checksum_address)
         return float(Decimal(amount) / Decimal(10 ** decimals))
 
     async def get_nonce(self) -> Nonce:
@@ -218,6 +279,17 @@ class Wallet(AsyncWeb3, Account):
                 else:
                     raise RuntimeError(f"Failed to get nonce after {self.MAX_RETRIES} attempts") from e
 
+    @property
+    def _chain_key(self) -> str:
+        return self.chain_name or self._provider.endpoint_uri
+
+    @property
+    def _nonce_key(self) -> tuple[str, str]:
+        return self._chain_key, self.wallet_address
+
+    async def reserve_nonce(self) -> Nonce:
+        return await nonce_manager.reserve(self._nonce_key, self.get_nonce)
+
     async def check_balance(self) -> bool:
         return await self.eth.get_balance(self.keypair.address)        
 
@@ -260,27 +332,35 @@ class Wallet(AsyncWeb3, Account):
         except Exception as error:
             raise ValueError(f"Signing failed: {str(error)}") from error
 
+    async def _fee_params(self, gas_price_buffer: float = 1.05) -> dict:
+        fees = await fee_oracle.for_chain(self._chain_key).suggest(self)
+        if fees.eip1559:
+            return {
+                "maxPriorityFeePerGas": int(fees.priority_fee * gas_price_buffer),
+                "maxFeePerGas": int((fees.base_fee * 2 + fees.priority_fee) * gas_price_buffer)
+            }
+        return {"gasPrice": int(fees.gas_price * gas_price_buffer)}
+
     async def _estimate_gas_params(
         self,
         tx_params: dict,
+        contract_function: Any = None,
         gas_buffer: float = 1.2,
-        gas_price_buffer: float = 1.05
+        gas_price_buffer: float = 1.05,
+        estimate_gas: bool = True,
+        estimate_fees: bool = True
     ) -> dict:
         try:
-            gas_estimate = await self.eth.estimate_gas(tx_params)
-            tx_params["gas"] = int(gas_estimate * gas_buffer)
-            
-            if await self.use_eip1559:
-                latest_block = await self.eth.get_block('latest')
-                base_fee = latest_block['baseFeePerGas']
-                priority_fee = await self.eth.max_priority_fee
-                
-                tx_params.update({
-                    "maxPriorityFeePerGas": int(priority_fee * gas_price_buffer),
-                    "maxFeePerGas": int((base_fee * 2 + priority_fee) * gas_price_buffer)
-                })
-            else:
-                tx_params["gasPrice"] = int(await self.eth.gas_price * gas_price_buffer)
+            # Fees and gas go in before build_transaction so web3 does not look them up again
+            if estimate_fees:
+                tx_params.update(await self._fee_params(gas_price_buffer))
+
+            if estimate_gas:
+                if contract_function is not None:
+                    gas_estimate = await contract_function.estimate_gas(tx_params)
+                else:
+                    gas_estimate = await self.eth.estimate_gas(tx_params)
+                tx_params["gas"] = int(gas_estimate * gas_buffer)
                 
             return tx_params
         except Exception as error:
@@ -296,10 +376,31 @@ class Wallet(AsyncWeb3, Account):
         gas: int = None,
         gas_price: int = None,
         **kwargs
+    ) -> dict:
+        nonce = await self.reserve_nonce()
+        try:
+            return await self._build_transaction_params(
+                nonce, contract_function, to, value, gas_buffer, gas_price_buffer, gas, gas_price, **kwargs
+            )
+        except BaseException:
+            nonce_manager.release(self._nonce_key, nonce)
+            raise
+
+    async def _build_transaction_params(
+        self,
+        nonce: Nonce,
+        contract_function: Any,
+        to: str | None,
+        value: int,
+        gas_buffer: float,
+        gas_price_buffer: float,
+        gas: int | None,
+        gas_price: int | None,
+        **kwargs
     ) -> dict:
         base_params = {
             "from": self.wallet_address,
-            "nonce": await self.get_nonce(),
+            "nonce": nonce,
             "value": value,
             **kwargs
         }
@@ -307,6 +408,8 @@ class Wallet(AsyncWeb3, Account):
         try:
             chain_id = await self.eth.chain_id
             base_params["chainId"] = chain_id
+        except ChainMismatchError:
+            raise
         except Exception as e:
             await self.logger_msg(
                 msg=f"Failed to get chain_id: {e}", 
@@ -325,14 +428,16 @@ class Wallet(AsyncWeb3, Account):
             if to is None:
                 raise ValueError("'to' address required for ETH transfers")
             base_params.update({"to": to})
-            if gas is None or gas_price is None:
-                return await self._estimate_gas_params(base_params, gas_buffer, gas_price_buffer)
-            return base_params
 
-        tx_params = await contract_function.build_transaction(base_params)
         if gas is None or gas_price is None:
-            return await self._estimate_gas_params(tx_params, gas_buffer, gas_price_buffer)
-        return tx_params
+            base_params = await self._estimate_gas_params(
+                base_params, contract_function, gas_buffer, gas_price_buffer,
+                estimate_gas=gas is None, estimate_fees=gas_price is None
+            )
+
+        if contract_function is None:
+            return base_params
+        return await contract_function.build_transaction(base_params)
 
     async def _check_and_approve_token(
         self, 
@@ -353,8 +458,7 @@ class Wallet(AsyncWeb3, Account):
 
             approve_params = await self.build_transaction_params(
                 contract_function=token_contract.functions.approve(spender_address, amount),
-                gas=250_000,
-                gas_price=40000000000
+                gas=250_000
             )
 
             success, result = await self._process_transaction(approve_params)
@@ -370,15 +474,17 @@ class Wallet(AsyncWeb3, Account):
         max_attempts = self.MAX_RETRIES
         current_attempt = 0
         last_error = None
+        broadcast = False
         
         while current_attempt < max_attempts:
             tx_hash = None
             try:
                 signed = self.keypair.sign_transaction(transaction)
                 tx_hash = await self.eth.send_raw_transaction(signed.raw_transaction)
+                broadcast = True
                 
                 receipt = await asyncio.wait_for(
-                    self.eth.wait_for_transaction_receipt(tx_hash),
+                    receipt_watcher.wait(self._chain_key, self, tx_hash),
                     timeout=self.DEFAULT_TIMEOUT
                 )
                 
@@ -389,6 +495,8 @@ class Wallet(AsyncWeb3, Account):
                 
             except asyncio.TimeoutError:
                 if tx_hash:
+                    # A stuck transaction blocks the nonces after it: re-read the count next time
+                    nonce_manager.invalidate(self._nonce_key)
                     await logger.logger_msg(
                         msg=f"Transaction sent but confirmation timed out. Hash: {tx_hash.hex()}", 
                         type_msg="warning", 
@@ -409,9 +517,9 @@ class Wallet(AsyncWeb3, Account):
                         class_name=self.__class__.__name__, method_name="send_and_verify_transaction"
                     )
                     try:
-                        new_nonce = await self.eth.get_transaction_count(self.wallet_address, 'pending')
-                        if new_nonce <= transaction['nonce']:
-                            new_nonce = transaction['nonce'] + 1
+                        new_nonce = await nonce_manager.resync(
+                            self._nonce_key, self.get_nonce, used=transaction['nonce']
+                        )
                         transaction['nonce'] = new_nonce
                         await logger.logger_msg(
                             msg=f"New nonce set: {new_nonce}", 
@@ -427,6 +535,8 @@ class Wallet(AsyncWeb3, Account):
                     delay = random.uniform(1, 3) * (2 ** current_attempt)
                     await asyncio.sleep(delay)
         
+        if not broadcast and "nonce" in transaction:
+            nonce_manager.release(self._nonce_key, transaction["nonce"])
         return False, f"Failed to execute transaction after {max_attempts} attempts. Last error: {str(last_error)}"
     
     async def _process_transaction(self, transaction: Any) -> tuple[bool, str]:
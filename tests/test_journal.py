@@ -0,0 +1,33 @@
+import time
+
+from src.utils.journal import RunJournal
+
+
+def _interrupted_run(path, module: str, last_result_at: float) -> int:
+    journal = RunJournal(path, enabled=True)
+    journal.start_run(module)
+    journal.record_account("0x" + "00" * 20, True, "ok")
+    journal._connect().execute("UPDATE accounts SET updated_at = ?", (last_result_at,))
+    journal._connect().execute("UPDATE runs SET started_at = ?", (last_result_at,))
+    journal.close()
+    return journal.run_id
+
+
+def test_recent_unfinished_run_is_resumed(tmp_path):
+    run_id = _interrupted_run(tmp_path / "journal.db", "faucet", time.time() - 3600)
+
+    journal = RunJournal(tmp_path / "journal.db", enabled=True, resume_max_age=12)
+
+    assert journal.start_run("faucet") is True
+    assert journal.run_id == run_id
+    assert "0x" + "00" * 20 in journal.completed_accounts()
+
+
+def test_stale_unfinished_run_is_not_resumed(tmp_path):
+    run_id = _interrupted_run(tmp_path / "journal.db", "faucet", time.time() - 13 * 3600)
+
+    journal = RunJournal(tmp_path / "journal.db", enabled=True, resume_max_age=12)
+
+    assert journal.start_run("faucet") is False
+    assert journal.run_id != run_id
+    assert journal.completed_accounts() == {}
@@ -0,0 +1,30 @@
+import pytest
+
+from src.models import Account
+from src.utils.key_derivation import KeyCache, _derive_chunk
+
+
+BAD_CHECKSUM_MNEMONIC = "abandon " * 11 + "zoo"
+PRIVATE_KEY = "0x" + "11" * 32
+
+
+def test_derive_rejects_bad_mnemonic_checksum_with_value_error():
+    with pytest.raises(ValueError):
+        Account.derive(BAD_CHECKSUM_MNEMONIC)
+
+
+def test_derive_chunk_returns_none_for_invalid_rows():
+    results = _derive_chunk([BAD_CHECKSUM_MNEMONIC, "not a key", PRIVATE_KEY])
+
+    assert results[:2] == [None, None]
+    assert results[2] == (bytes(Account.derive(PRIVATE_KEY).key), Account.derive(PRIVATE_KEY).address)
+
+
+def test_materialize_leaves_invalid_rows_to_fail_on_use(tmp_path):
+    bad, good = Account(BAD_CHECKSUM_MNEMONIC, index=1), Account(PRIVATE_KEY, index=2)
+
+    KeyCache(tmp_path / "account_keys.json").materialize([bad, good])
+
+    assert good.address == Account.derive(PRIVATE_KEY).address
+    with pytest.raises(ValueError):
+        bad.address
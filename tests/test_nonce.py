@@ -0,0 +1,32 @@
+import asyncio
+
+from src.rpc.nonce import NonceManager
+
+
+KEY = ("EXPchain", "0x" + "00" * 20)
+
+
+async def _pending_count() -> int:
+    return 5
+
+
+def test_released_nonce_below_outstanding_ones_is_reused_once():
+    async def scenario():
+        manager = NonceManager()
+        first = await manager.reserve(KEY, _pending_count)
+        await manager.reserve(KEY, _pending_count)
+        manager.release(KEY, first)
+        return [await manager.reserve(KEY, _pending_count) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [5, 7]
+
+
+def test_releasing_the_highest_nonces_rewinds_the_counter():
+    async def scenario():
+        manager = NonceManager()
+        nonces = [await manager.reserve(KEY, _pending_count) for _ in range(3)]
+        manager.release(KEY, nonces[1])
+        manager.release(KEY, nonces[2])
+        return await manager.reserve(KEY, _pending_count), await manager.reserve(KEY, _pending_count)
+
+    assert asyncio.run(scenario()) == (6, 7)